@@ -7,6 +7,8 @@ const CONFIG = {
     ADMIN_ENDPOINT: 'https://dkmogwhqc8.execute-api.us-west-1.amazonaws.com/prod/admin-data',
     DELETE_ENDPOINT: 'https://dkmogwhqc8.execute-api.us-west-1.amazonaws.com/prod/delete-submission',
     PIN_AUTH_ENDPOINT: 'https://dkmogwhqc8.execute-api.us-west-1.amazonaws.com/prod/pin-auth',
+    EXPORT_ENDPOINT: 'https://dkmogwhqc8.execute-api.us-west-1.amazonaws.com/prod/admin-export',
+    STATS_ENDPOINT: 'https://dkmogwhqc8.execute-api.us-west-1.amazonaws.com/prod/admin-stats',
     TIMEOUT: 10000,
     RETRY_ATTEMPTS: 3,
     RETRY_DELAY: 1000
@@ -42,6 +44,9 @@ let allData = [];
 let meetingsData = [];
 let connectionsData = [];
 
+// Watermark from the last /admin-data response; later loads fetch only changes after it
+let syncWatermark = null;
+
 // Mobile optimization function
 function optimizeForMobile() {
     // Prevent zoom on input focus for iOS
@@ -450,6 +455,7 @@ function handleLogout() {
     // Reset authentication state
     isAuthenticated = false;
     authToken = null;
+    syncWatermark = null;
     
     // Show login screen
     showLoginScreen();
@@ -498,6 +504,20 @@ async function loadData() {
     showLoading(true);
     
     try {
+        // After the first load, fetch only what changed since the last watermark
+        if (syncWatermark) {
+            const delta = await fetchAdminDelta(syncWatermark);
+            if (delta) {
+                if (applyDelta(delta)) {
+                    sortData();
+                    updateStats();
+                    renderTables();
+                }
+                await loadStats();
+                return;
+            }
+        }
+        
         const data = await fetchAdminData();
         
         if (data.length === 0) {
@@ -506,33 +526,12 @@ async function loadData() {
             connectionsData = [];
         } else {
             allData = data;
-            
-            // Separate meetings and connections
-            meetingsData = allData.filter(item => item.type === 'meeting');
-            connectionsData = allData.filter(item => item.type === 'connection');
-            
-            // Sort meetings by actual meeting time (soonest to latest)
-            meetingsData.sort((a, b) => {
-                const timeA = getActualMeetingTime(a);
-                const timeB = getActualMeetingTime(b);
-                
-                // If both have valid meeting times, sort by time (soonest first)
-                if (timeA && timeB) {
-                    return timeA - timeB;
-                }
-                // If only one has a valid meeting time, prioritize it
-                if (timeA && !timeB) return -1;
-                if (!timeA && timeB) return 1;
-                // If neither has a valid meeting time, sort by submission timestamp (oldest first)
-                return new Date(a.timestamp) - new Date(b.timestamp);
-            });
-            
-            // Sort connections by submission date (newest first)
-            connectionsData.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
+            sortData();
         }
         
         updateStats();
         renderTables();
+        await loadStats();
         
     } catch (error) {
         showError(`Failed to load data: ${error.message}`);
@@ -541,6 +540,84 @@ async function loadData() {
     }
 }
 
+// Separate meetings and connections and sort them for display
+function sortData() {
+    meetingsData = allData.filter(item => item.type === 'meeting');
+    connectionsData = allData.filter(item => item.type === 'connection');
+    
+    // Sort meetings by actual meeting time (soonest to latest)
+    meetingsData.sort((a, b) => {
+        const timeA = getActualMeetingTime(a);
+        const timeB = getActualMeetingTime(b);
+        
+        // If both have valid meeting times, sort by time (soonest first)
+        if (timeA && timeB) {
+            return timeA - timeB;
+        }
+        // If only one has a valid meeting time, prioritize it
+        if (timeA && !timeB) return -1;
+        if (!timeA && timeB) return 1;
+        // If neither has a valid meeting time, sort by submission timestamp (oldest first)
+        return new Date(a.timestamp) - new Date(b.timestamp);
+    });
+    
+    // Sort connections by submission date (newest first)
+    connectionsData.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
+}
+
+// Merge a delta response into allData; returns false when nothing changed
+function applyDelta(delta) {
+    const submissions = delta.submissions || [];
+    
+    // The server falls back to a full list when the watermark is too old
+    if (!delta.deleted) {
+        allData = submissions;
+        return true;
+    }
+    
+    // Deltas overlap the previous one slightly, so skip submissions already held
+    const known = new Set(allData.map(item => item.id));
+    const added = submissions.filter(item => !known.has(item.id));
+    const deleted = new Set(delta.deleted.filter(id => known.has(id)));
+    if (added.length === 0 && deleted.size === 0) {
+        return false;
+    }
+    
+    allData = allData.filter(item => !deleted.has(item.id)).concat(added);
+    return true;
+}
+
+// Fetch changes since a watermark; returns null so the caller falls back to a full load
+async function fetchAdminDelta(since) {
+    try {
+        let url = CONFIG.ADMIN_ENDPOINT;
+        const params = new URLSearchParams();
+        params.set('since', since);
+        params.set('token', authToken);
+        const sep = url.includes('?') ? '&' : '?';
+        url = `${url}${sep}${params.toString()}`;
+        
+        const response = await fetch(url, {
+            method: 'GET',
+            mode: 'cors',
+            cache: 'no-cache',
+            headers: {
+                'Accept': 'application/json'
+            }
+        });
+        
+        if (!response.ok) {
+            return null;
+        }
+        
+        const data = await response.json();
+        syncWatermark = data.watermark || null;
+        return data;
+    } catch (error) {
+        return null;
+    }
+}
+
 // Fetch data from API
 async function fetchAdminData() {
     try {
@@ -584,9 +661,11 @@ async function fetchAdminData() {
         const sep = url.includes('?') ? '&' : '?';
         url = `${url}${sep}token=${encodeURIComponent(authToken)}`;
         
+        // no-cache revalidates with If-None-Match, so unchanged data comes back as a cheap 304
         const response = await fetch(url, {
             method: 'GET',
             mode: 'cors',
+            cache: 'no-cache',
             headers: {
                 'Accept': 'application/json'
             }
@@ -610,6 +689,7 @@ async function fetchAdminData() {
         }
         
         const data = await response.json();
+        syncWatermark = data.watermark || null;
         
         // Handle different response formats
         if (Array.isArray(data)) {
@@ -651,6 +731,41 @@ function updateStats() {
     if (connectionsCount) connectionsCount.textContent = connectionsData.length;
 }
 
+// Replace the headline numbers with the server-side counters from /admin-stats
+async function loadStats() {
+    if (IS_LOCAL || !isAuthenticated || !authToken || authToken === 'test-token') {
+        return;
+    }
+    
+    try {
+        let url = CONFIG.STATS_ENDPOINT;
+        const sep = url.includes('?') ? '&' : '?';
+        url = `${url}${sep}token=${encodeURIComponent(authToken)}`;
+        
+        const response = await fetch(url, {
+            method: 'GET',
+            mode: 'cors',
+            headers: {
+                'Accept': 'application/json'
+            }
+        });
+        if (!response.ok) {
+            return;
+        }
+        
+        const stats = await response.json();
+        const now = new Date();
+        const today = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}-${String(now.getDate()).padStart(2, '0')}`;
+        const byType = stats.byType || {};
+        
+        if (totalMeetingsEl) totalMeetingsEl.textContent = byType.meeting || 0;
+        if (totalConnectionsEl) totalConnectionsEl.textContent = byType.connection || 0;
+        if (todayMeetingsEl) todayMeetingsEl.textContent = (stats.meetingsByDay || {})[today] || 0;
+    } catch (error) {
+        // Keep the numbers computed from the loaded data
+    }
+}
+
 // Render both tables
 function renderTables() {
     renderMeetingsTable();
@@ -1318,7 +1433,17 @@ async function deleteFromAPI(id) {
 }
 
 // Export data
-function exportData(type = 'all') {
+async function exportData(type = 'all') {
+    // Prefer the server-side export so large datasets are not rebuilt in the browser
+    if (!IS_LOCAL && isAuthenticated && authToken) {
+        try {
+            await exportFromAPI(type);
+            return;
+        } catch (error) {
+            // Fall back to building the CSV from the loaded data
+        }
+    }
+    
     let dataToExport = [];
     let filename = '';
     
@@ -1340,6 +1465,46 @@ function exportData(type = 'all') {
     downloadCSV(csvContent, filename);
 }
 
+// Export from API
+async function exportFromAPI(type) {
+    const params = new URLSearchParams();
+    params.set('format', 'csv');
+    if (type === 'meetings') {
+        params.set('type', 'meeting');
+    } else if (type === 'connections') {
+        params.set('type', 'connection');
+    }
+    params.set('token', authToken);
+    let url = CONFIG.EXPORT_ENDPOINT;
+    const sep = url.includes('?') ? '&' : '?';
+    url = `${url}${sep}${params.toString()}`;
+    
+    const response = await fetch(url, {
+        method: 'GET',
+        mode: 'cors'
+    });
+    
+    if (!response.ok) {
+        throw new Error(`Failed to export: ${response.status}`);
+    }
+    
+    // Large exports come back as a short-lived download link
+    const contentType = response.headers.get('Content-Type') || '';
+    if (contentType.includes('application/json')) {
+        const data = await response.json();
+        if (!data.downloadUrl) {
+            throw new Error('Export did not return a download URL');
+        }
+        window.location.href = data.downloadUrl;
+        return;
+    }
+    
+    const disposition = response.headers.get('Content-Disposition') || '';
+    const match = disposition.match(/filename="([^"]+)"/);
+    const filename = match ? match[1] : `tesconnections-${type}-data.csv`;
+    downloadCSV(await response.text(), filename);
+}
+
 // Generate CSV content
 function generateCSV(data) {
     const headers = ['ID', 'Name', 'Communication', 'Contact Details', 'Meeting Time', 'Comments', 'Submitted', 'Type'];
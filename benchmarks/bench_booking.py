@@ -0,0 +1,102 @@
+"""
+Contention benchmark: N concurrent bookings of the same time slot
+
+Compares the original scan-then-put booking path with the single
+TransactWriteItems call in save_submission, against the in-memory
+stand-in. Reports throughput, round trips and whether exactly `capacity`
+bookings won with the slot counter matching the stored submissions.
+
+Usage: python benchmarks/bench_booking.py [bookers] [simulated_latency_ms] [capacity]
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import lambda_function  # noqa: E402
+from fake_dynamodb import FakeDynamoDB  # noqa: E402
+
+TIME_SLOT = '2025-09-17-10:15'
+
+def legacy_save(item):
+    """
+    The original booking path: scan for the slot, then put the submission
+    """
+    table = lambda_function.table
+    response = table.scan(
+        FilterExpression='timeSlot = :time_slot',
+        ExpressionAttributeValues={':time_slot': item['timeSlot']}
+    )
+    if len(response.get('Items', [])) >= lambda_function.SLOT_CAPACITY[item['timeSlot']]:
+        return 409, "already booked"
+    table.put_item(Item=item)
+    return 200, ""
+
+def make_item():
+    return {
+        'id': str(uuid.uuid4()),
+        'name': 'Load Test',
+        'communication': 'email',
+        'timeSlot': TIME_SLOT,
+        'createdAt': '2025-09-01T00:00:00',
+        'status': 'new'
+    }
+
+def contend(save, bookers, latency):
+    lambda_function.dynamodb = resource = FakeDynamoDB(latency=latency)
+    lambda_function.table = table = resource.Table(lambda_function.table_name)
+    statuses = []
+    barrier = threading.Barrier(bookers)
+
+    def booker():
+        item = make_item()
+        barrier.wait()
+        statuses.append(save(item)[0])
+
+    threads = [threading.Thread(target=booker) for _ in range(bookers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    capacity = lambda_function.SLOT_CAPACITY[TIME_SLOT]
+    bookings = [item for item in table.items.values()
+                if item.get('timeSlot') == TIME_SLOT and not lambda_function.is_internal_key(item['id'])]
+    counter = table.items.get(lambda_function.get_slot_key(TIME_SLOT), {}).get('booked', len(bookings))
+    correct = len(bookings) == capacity == statuses.count(200) == counter
+    return {
+        'throughput': bookers / elapsed,
+        'round_trips': resource.calls / bookers,
+        'won': statuses.count(200),
+        'conflicts': statuses.count(409),
+        'stored': len(bookings),
+        'correct': correct
+    }
+
+def main():
+    bookers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    capacity = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    original = lambda_function.dynamodb, lambda_function.table, lambda_function.SLOT_CAPACITY[TIME_SLOT]
+    lambda_function.SLOT_CAPACITY[TIME_SLOT] = capacity
+    try:
+        for name, save in (('scan + put', legacy_save), ('transaction', lambda_function.save_submission)):
+            result = contend(save, bookers, latency)
+            print(f"{name:12s} {result['throughput']:8.0f} bookings/s  {result['round_trips']:.1f} round trips/booking  "
+                  f"won={result['won']} conflicts={result['conflicts']} stored={result['stored']}  "
+                  f"{'OK' if result['correct'] else 'OVERBOOKED'}")
+    finally:
+        lambda_function.dynamodb, lambda_function.table, lambda_function.SLOT_CAPACITY[TIME_SLOT] = original
+
+    # The booking path in lambda_function.py must never overbook
+    if not result['correct']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
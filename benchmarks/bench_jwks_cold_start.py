@@ -0,0 +1,97 @@
+"""
+Cold-start benchmark: stdlib vs. requests JWKS fetcher
+
+Starts a fresh interpreter per run (a cold container), imports
+lambda_function with JWKS_FETCHER set to each variant and fetches a JWKS
+from a local keep-alive HTTP server twice. Reports the module init time,
+the first fetch (including any imports it triggers), the second fetch
+(connection reuse) and peak RSS.
+
+Usage: python benchmarks/bench_jwks_cold_start.py [runs]
+"""
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+JWKS = json.dumps({'keys': [
+    {'kid': f'key-{i}', 'kty': 'RSA', 'alg': 'RS256', 'use': 'sig', 'e': 'AQAB', 'n': 'x' * 342}
+    for i in range(2)
+]}).encode('utf-8')
+
+class JWKSHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+    wbufsize = -1  # One write per response, so Nagle doesn't stall reused connections
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(JWKS)))
+        self.end_headers()
+        self.wfile.write(JWKS)
+
+    def log_message(self, *args):
+        pass
+
+def child(url):
+    """
+    Runs in the fresh interpreter: init, then two fetches
+    """
+    sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+    start = time.perf_counter()
+    import lambda_function
+    init = time.perf_counter() - start
+
+    lambda_function.COGNITO_JWKS_URL = url
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        jwks = lambda_function.get_cognito_public_keys()
+        timings.append(time.perf_counter() - start)
+        if not jwks or len(jwks['keys']) != 2:
+            raise RuntimeError('JWKS fetch failed')
+
+    print(json.dumps({
+        'initMs': init * 1000,
+        'firstFetchMs': timings[0] * 1000,
+        'secondFetchMs': timings[1] * 1000,
+        'maxRssMb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'requestsLoaded': 'requests' in sys.modules
+    }))
+
+def run(fetcher, url):
+    env = dict(os.environ, JWKS_FETCHER=fetcher)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+    output = subprocess.run([sys.executable, __file__, '--child', url], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JWKSHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/.well-known/jwks.json"
+
+    try:
+        for fetcher in ('requests', 'stdlib'):
+            results = [run(fetcher, url) for _ in range(runs)]
+            median = {key: statistics.median(result[key] for result in results)
+                      for key in ('initMs', 'firstFetchMs', 'secondFetchMs', 'maxRssMb')}
+            print(f"{fetcher:9s} init {median['initMs']:7.1f} ms  first fetch {median['firstFetchMs']:6.1f} ms  "
+                  f"second fetch {median['secondFetchMs']:5.2f} ms  max RSS {median['maxRssMb']:6.1f} MB  "
+                  f"requests loaded={results[0]['requestsLoaded']}")
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        child(sys.argv[2])
+    else:
+        main()
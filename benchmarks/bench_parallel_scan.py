@@ -0,0 +1,63 @@
+"""
+Benchmark: single-threaded paginated scan vs. parallel_scan with
+increasing segment counts, against the in-memory stand-in
+
+Pages are capped at a fixed item count to mimic DynamoDB's 1MB limit and
+every page costs one simulated round trip.
+
+Usage: python benchmarks/bench_parallel_scan.py [items] [page_size] [simulated_latency_ms]
+"""
+import os
+import sys
+import time
+import uuid
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import lambda_function  # noqa: E402
+from fake_dynamodb import FakeDynamoDB  # noqa: E402
+
+def sequential_scan():
+    """
+    Single-threaded scan following LastEvaluatedKey
+    """
+    scan_kwargs = {'ProjectionExpression': 'id, createdAt'}
+    while True:
+        response = lambda_function.table.scan(**scan_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 50.0) / 1000
+
+    original = lambda_function.dynamodb, lambda_function.table
+    lambda_function.dynamodb = resource = FakeDynamoDB(latency=latency, page_size=page_size)
+    lambda_function.table = table = resource.Table(lambda_function.table_name)
+    for index in range(items):
+        table.items[str(uuid.uuid4())] = {'id': str(uuid.uuid4()), 'createdAt': f'2025-09-17T{index:08d}'}
+    table.items = {item['id']: item for item in table.items.values()}
+
+    try:
+        runs = [('sequential', sequential_scan)]
+        for segments in (1, 2, 4, 8, 16):
+            runs.append((f'{segments} segments', lambda segments=segments: lambda_function.parallel_scan(
+                projection='id, createdAt', total_segments=segments)))
+
+        baseline = None
+        for name, scan in runs:
+            start = time.perf_counter()
+            seen = {item['id'] for item in scan()}
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            status = 'OK' if len(seen) == items else f'MISSING {items - len(seen)}'
+            print(f"{name:12s} {elapsed * 1000:8.1f} ms  {baseline / elapsed:5.1f}x  {len(seen)} items  {status}")
+    finally:
+        lambda_function.dynamodb, lambda_function.table = original
+
+if __name__ == '__main__':
+    main()
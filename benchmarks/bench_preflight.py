@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: OPTIONS preflight through lambda_handler vs. the original path
+
+The original handler probed six header casings, ran urlparse on the origin,
+built a fresh CORS header dict and serialized the preflight body on every
+request; lambda_handler now returns a prebuilt response per origin.
+
+Usage: python benchmarks/bench_preflight.py [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+from urllib.parse import urlparse
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import lambda_function  # noqa: E402
+
+# Browser preflights: allowed origins, a referer-only client and a foreign origin
+EVENT_MIX = (
+    [{'httpMethod': 'OPTIONS', 'path': '/admin-data', 'headers': {'origin': 'https://tesconnections.com'}}] * 60 +
+    [{'httpMethod': 'OPTIONS', 'path': '/submit-contact', 'headers': {'Origin': 'http://localhost:8000'}}] * 20 +
+    [{'httpMethod': 'OPTIONS', 'path': '/availability', 'headers': {'Referer': 'https://tesconnections.com/meetings'}}] * 15 +
+    [{'httpMethod': 'OPTIONS', 'path': '/admin-data', 'headers': {'Origin': 'https://example.com'}}] * 5
+)
+
+def legacy_cors_headers(origin):
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': 'https://tesconnections.com',
+        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,If-None-Match',
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+        'Access-Control-Expose-Headers': 'ETag,Content-Disposition',
+        'Access-Control-Max-Age': '86400'
+    }
+    if origin and origin in lambda_function.ALLOWED_ORIGINS:
+        headers['Access-Control-Allow-Origin'] = origin
+    return headers
+
+def legacy_preflight(event):
+    """
+    The original lambda_handler preflight path
+    """
+    headers_in = event.get('headers', {}) or {}
+    origin = (headers_in.get('origin') or
+              headers_in.get('Origin') or
+              headers_in.get('ORIGIN') or
+              headers_in.get('referer') or
+              headers_in.get('Referer') or
+              headers_in.get('REFERER') or '')
+    if origin.startswith('http'):
+        parsed = urlparse(origin)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+    cors_headers = legacy_cors_headers(origin)
+    if event.get('httpMethod') == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': cors_headers,
+            'body': json.dumps({'message': 'CORS preflight successful'})
+        }
+
+def run_mix(handler):
+    for event in EVENT_MIX:
+        handler(event)
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    requests_per_run = len(EVENT_MIX) * iterations
+
+    for event in EVENT_MIX:
+        if legacy_preflight(event) != lambda_function.lambda_handler(event, None):
+            print(f"MISMATCH for {event['headers']}")
+            return 1
+
+    handlers = (('original', legacy_preflight), ('prebuilt', lambda event: lambda_function.lambda_handler(event, None)))
+    for name, handler in handlers:
+        best = min(timeit.repeat(lambda: run_mix(handler), number=iterations, repeat=5))
+        print(f"{name:10s} {best * 1e9 / requests_per_run:8.1f} ns/request")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark: atomic single-UpdateItem rate limiter vs. the original
+get_item + update_item/put_item sequence, against the in-memory stand-in
+
+Reports DynamoDB round trips and latency per check, then hammers one IP
+from many threads to show which implementation holds the limit.
+
+Usage: python benchmarks/bench_rate_limit.py [simulated_latency_ms]
+"""
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import lambda_function  # noqa: E402
+from fake_dynamodb import FakeTable  # noqa: E402
+
+def legacy_check_rate_limit(ip_address):
+    """
+    The original read-then-write limiter
+    """
+    table = lambda_function.rate_limit_table
+    rate_key = f"rate_limit_{ip_address}_{int(time.time() // lambda_function.RATE_LIMIT_WINDOW)}"
+    response = table.get_item(Key={'id': rate_key})
+    if 'Item' in response:
+        if response['Item'].get('count', 0) >= lambda_function.MAX_REQUESTS_PER_WINDOW:
+            return False, "Rate limit exceeded. Please try again later."
+        table.update_item(
+            Key={'id': rate_key},
+            UpdateExpression='SET #count = #count + :inc',
+            ExpressionAttributeNames={'#count': 'count'},
+            ExpressionAttributeValues={':inc': 1}
+        )
+    else:
+        table.put_item(Item={
+            'id': rate_key,
+            'count': 1,
+            'ttl': int(time.time()) + (lambda_function.RATE_LIMIT_WINDOW * 2)
+        })
+    return True, ""
+
+def measure(check, latency, clients=200):
+    lambda_function.rate_limit_table = table = FakeTable(latency=latency)
+    start = time.perf_counter()
+    for client in range(clients):
+        check(f"10.0.{client // 256}.{client % 256}")
+    elapsed = time.perf_counter() - start
+    return table.calls / clients, elapsed * 1000 / clients
+
+def hammer(check, latency, threads=50):
+    lambda_function.rate_limit_table = FakeTable(latency=latency)
+    allowed = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        if check('203.0.113.7')[0]:
+            allowed.append(1)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return len(allowed)
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 5.0) / 1000
+    limit = lambda_function.MAX_REQUESTS_PER_WINDOW
+    original_table = lambda_function.rate_limit_table
+    try:
+        for name, check in (('get+put/update', legacy_check_rate_limit),
+                            ('atomic update', lambda_function.check_rate_limit)):
+            round_trips, latency_ms = measure(check, latency)
+            allowed = hammer(check, latency)
+            verdict = 'OK' if allowed <= limit else 'LIMIT BROKEN'
+            print(f"{name:15s} {round_trips:.1f} round trips/check  {latency_ms:6.2f} ms/check  "
+                  f"concurrent: {allowed}/{limit} allowed ({verdict})")
+    finally:
+        lambda_function.rate_limit_table = original_table
+    
+    # The limiter in lambda_function.py must never let a burst through
+    if allowed > limit:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
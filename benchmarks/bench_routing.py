@@ -0,0 +1,98 @@
+"""
+Micro-benchmark: route table lookup vs. the original if/elif dispatch chain
+
+Both variants authenticate admin requests for real (a PIN session token,
+verified once and then served from the token cache), so the difference is
+the dispatch itself: the original chain ran validate_admin_access, with its
+path check, for every request past /availability, while the route table
+normalizes the path once and only authenticates admin routes.
+
+Usage: python benchmarks/bench_routing.py [iterations]
+"""
+import os
+import sys
+import timeit
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import lambda_function  # noqa: E402
+
+ADMIN_HEADERS = {'Authorization': f"Bearer {lambda_function.generate_pin_session_token()}"}
+
+# Realistic API Gateway traffic mix: mostly availability polls and form posts
+EVENT_MIX = (
+    [{'httpMethod': 'GET', 'path': '/prod/availability', 'headers': {}}] * 40 +
+    [{'httpMethod': 'POST', 'path': '/prod/submit-contact', 'headers': {}}] * 30 +
+    [{'httpMethod': 'GET', 'path': '/prod/admin-data', 'headers': ADMIN_HEADERS}] * 15 +
+    [{'httpMethod': 'DELETE', 'path': '/prod/delete-submission', 'headers': ADMIN_HEADERS}] * 5 +
+    [{'httpMethod': 'POST', 'path': '/prod/pin-auth', 'headers': {}}] * 5 +
+    [{'httpMethod': 'OPTIONS', 'path': '/prod/admin-data', 'headers': {}}] * 5
+)
+
+LEGACY_ADMIN_PATHS = ['/admin-data', '/delete-submission']
+
+def legacy_validate_admin_access(event):
+    """
+    The original validate_admin_access: path check, then token verification
+    """
+    path = event.get('path', '')
+    if not any(path.endswith(admin_path) for admin_path in LEGACY_ADMIN_PATHS):
+        return True, None
+    headers = event.get('headers', {})
+    token = headers.get('Authorization') or headers.get('authorization')
+    if not token:
+        return False, "Authorization header missing"
+    return lambda_function.verify_admin_token(token)
+
+def legacy_dispatch(event):
+    """
+    The original lambda_handler chain: substring tests in declaration order,
+    with admin validation for every request past /availability
+    """
+    if event['httpMethod'] == 'OPTIONS':
+        return 'options'
+    if event['httpMethod'] == 'GET' and '/availability' in event.get('path', ''):
+        return 'availability'
+    if not legacy_validate_admin_access(event)[0]:
+        return 'unauthorized'
+    if event['httpMethod'] == 'POST' and '/pin-auth' in event.get('path', ''):
+        return 'pin-auth'
+    if event['httpMethod'] == 'GET' and '/admin-data' in event.get('path', ''):
+        return 'admin-data'
+    if event['httpMethod'] == 'DELETE' and '/delete-submission' in event.get('path', ''):
+        return 'delete-submission'
+    return 'submit-contact'
+
+def route_table_dispatch(event):
+    """
+    lambda_handler's dispatch: one route key, one lookup, admin routes authenticated
+    """
+    if event['httpMethod'] == 'OPTIONS':
+        return 'options'
+    route_key = lambda_function.get_route_key(event)
+    route = lambda_function.resolve_route(route_key)
+    if route.auth == 'admin' and not lambda_function.validate_admin_access(event)[0]:
+        return 'unauthorized'
+    return route
+
+def run_mix(dispatch):
+    for event in EVENT_MIX:
+        dispatch(event)
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    requests_per_run = len(EVENT_MIX) * iterations
+
+    for event in EVENT_MIX:
+        if 'unauthorized' in (legacy_dispatch(event), route_table_dispatch(event)):
+            print(f"FAIL: {event['path']} was not authorized")
+            return 1
+
+    for name, dispatch in (('if-chain', legacy_dispatch), ('route table', route_table_dispatch)):
+        best = min(timeit.repeat(lambda: run_mix(dispatch), number=iterations, repeat=5))
+        print(f"{name:12s} {best * 1e9 / requests_per_run:8.1f} ns/request")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,525 @@
+"""
+In-memory DynamoDB stand-in for local benchmarks
+
+Implements the subset of the boto3 Table API used by lambda_function.py
+(get_item, put_item, update_item, delete_item, scan, query, batch_writer) and of the
+low-level client's transact_write_items and scan, including condition, filter and
+update expressions on top-level attributes. Every call counts as one round
+trip and can sleep for a simulated network latency. Each operation is
+atomic, like a single DynamoDB request.
+"""
+import bisect
+import re
+import threading
+import time
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+_TOKEN_RE = re.compile(r"\s*(<>|<=|>=|[=<>(),+\-]|[:#]?[A-Za-z_][A-Za-z0-9_\-]*)")
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if not match:
+            raise ValueError(f"Cannot parse expression near: {expression[position:]!r}")
+        tokens.append(match.group(1))
+        position = match.end()
+        while position < len(expression) and expression[position].isspace():
+            position += 1
+    return tokens
+
+def _number(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    return value
+
+class _Expression:
+    """
+    Recursive-descent evaluator for DynamoDB expressions
+    """
+
+    def __init__(self, expression, names, values):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self, expected=None):
+        token = self.peek()
+        if expected is not None and (token is None or token.upper() != expected):
+            raise ValueError(f"Expected {expected!r}, got {token!r}")
+        self.position += 1
+        return token
+
+    def attribute_name(self, token):
+        return self.names[token] if token.startswith('#') else token
+
+    # Operands
+
+    def operand(self, item):
+        token = self.take()
+        if token.startswith(':'):
+            return _number(self.values[token])
+        if self.peek() == '(':
+            return self.function(token, item)
+        return item.get(self.attribute_name(token))
+
+    def value(self, item):
+        left = self.operand(item)
+        while self.peek() in ('+', '-'):
+            operator = self.take()
+            right = self.operand(item)
+            left = left + right if operator == '+' else left - right
+        return left
+
+    def function(self, name, item):
+        self.take('(')
+        if name == 'if_not_exists':
+            path = self.attribute_name(self.take())
+            self.take(',')
+            default = self.value(item)
+            self.take(')')
+            return item[path] if path in item else default
+        if name in ('attribute_exists', 'attribute_not_exists'):
+            path = self.attribute_name(self.take())
+            self.take(')')
+            return (path in item) == (name == 'attribute_exists')
+        if name == 'begins_with':
+            subject = self.value(item)
+            self.take(',')
+            prefix = self.value(item)
+            self.take(')')
+            return isinstance(subject, str) and subject.startswith(prefix)
+        if name == 'size':
+            subject = self.value(item)
+            self.take(')')
+            return Decimal(len(subject)) if subject is not None else None
+        raise ValueError(f"Unsupported function {name}")
+
+    # Conditions
+
+    def condition(self, item):
+        result = self.conjunction(item)
+        while self.peek() and self.peek().upper() == 'OR':
+            self.take()
+            right = self.conjunction(item)
+            result = result or right
+        return result
+
+    def conjunction(self, item):
+        result = self.negation(item)
+        while self.peek() and self.peek().upper() == 'AND':
+            self.take()
+            right = self.negation(item)
+            result = result and right
+        return result
+
+    def negation(self, item):
+        if self.peek() and self.peek().upper() == 'NOT':
+            self.take()
+            return not self.negation(item)
+        if self.peek() == '(':
+            self.take('(')
+            result = self.condition(item)
+            self.take(')')
+            return result
+        return self.comparison(item)
+
+    def comparison(self, item):
+        left = self.value(item)
+        operator = self.peek()
+        if operator is not None and operator.upper() == 'BETWEEN':
+            self.take()
+            low = self.value(item)
+            self.take('AND')
+            high = self.value(item)
+            return left is not None and low <= left <= high
+        if operator not in ('=', '<>', '<', '<=', '>', '>='):
+            return bool(left)
+        self.take()
+        right = self.value(item)
+        if operator == '=':
+            return left == right
+        if operator == '<>':
+            return left != right
+        if left is None or right is None or type(left) is not type(right):
+            return False
+        return {
+            '<': left < right,
+            '<=': left <= right,
+            '>': left > right,
+            '>=': left >= right,
+        }[operator]
+
+    def evaluate_condition(self, item):
+        result = self.condition(item)
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected token {self.peek()!r}")
+        return result
+
+    # Updates
+
+    def apply_update(self, item):
+        clauses = ('SET', 'ADD', 'REMOVE', 'DELETE')
+        while self.peek() is not None:
+            clause = self.take().upper()
+            if clause not in clauses:
+                raise ValueError(f"Unexpected update clause {clause!r}")
+            while True:
+                path = self.attribute_name(self.take())
+                if clause == 'SET':
+                    self.take('=')
+                    item[path] = self.value(item)
+                elif clause == 'ADD':
+                    amount = self.operand(item)
+                    if isinstance(amount, set):
+                        item[path] = set(item.get(path, set())) | amount
+                    else:
+                        item[path] = item.get(path, Decimal(0)) + amount
+                elif clause == 'DELETE':
+                    remaining = set(item.get(path, set())) - self.operand(item)
+                    if remaining:
+                        item[path] = remaining
+                    else:
+                        item.pop(path, None)
+                else:
+                    item.pop(path, None)
+                if self.peek() != ',':
+                    break
+                self.take(',')
+
+def _matches(expression, names, values, item):
+    return _Expression(expression, names, values).evaluate_condition(item)
+
+def _conditional_check_failed(operation):
+    return ClientError(
+        {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+        operation
+    )
+
+def _normalize(item):
+    return {key: _number(value) for key, value in item.items()}
+
+class _BatchWriter:
+    """
+    Buffers writes and flushes them 25 at a time, like boto3's batch_writer
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def put_item(self, Item):
+        self.pending.append(('put', Item))
+        if len(self.pending) >= 25:
+            self.flush()
+
+    def delete_item(self, Key):
+        self.pending.append(('delete', Key))
+        if len(self.pending) >= 25:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.table._round_trip()
+        with self.table.lock:
+            for action, value in self.pending:
+                if action == 'put':
+                    self.table.items[value[self.table.hash_key]] = _normalize(value)
+                else:
+                    self.table.items.pop(value[self.table.hash_key], None)
+                self.table.writes += 1
+        self.pending = []
+
+class FakeTable:
+    """
+    Thread-safe in-memory table keyed on a single hash key
+    """
+
+    def __init__(self, name='fake-table', hash_key='id', latency=0.0, indexes=None, page_size=None):
+        self.name = name
+        self.table_name = name
+        self.hash_key = hash_key
+        self.latency = latency
+        self.indexes = indexes or {}  # index name -> (hash attribute, range attribute)
+        self.page_size = page_size
+        self.items = {}
+        self.calls = 0
+        self.writes = 0
+        self._segments = {}
+        self.lock = threading.RLock()
+
+    def _round_trip(self):
+        with self.lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _check(self, item, condition, names, values, operation):
+        if condition and not _matches(condition, names, values, item or {}):
+            raise _conditional_check_failed(operation)
+
+    def get_item(self, Key, **kwargs):
+        self._round_trip()
+        with self.lock:
+            item = self.items.get(Key[self.hash_key])
+            return {'Item': dict(item)} if item is not None else {}
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeNames=None,
+                 ExpressionAttributeValues=None, **kwargs):
+        self._round_trip()
+        with self.lock:
+            key = Item[self.hash_key]
+            self._check(self.items.get(key), ConditionExpression, ExpressionAttributeNames,
+                        ExpressionAttributeValues, 'PutItem')
+            self.items[key] = _normalize(Item)
+            self.writes += 1
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression=None, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues='NONE', **kwargs):
+        self._round_trip()
+        with self.lock:
+            key = Key[self.hash_key]
+            existing = self.items.get(key)
+            self._check(existing, ConditionExpression, ExpressionAttributeNames,
+                        ExpressionAttributeValues, 'UpdateItem')
+            item = dict(existing) if existing else dict(Key)
+            _Expression(UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues).apply_update(item)
+            self.items[key] = item
+            self.writes += 1
+            if ReturnValues in ('ALL_NEW', 'UPDATED_NEW'):
+                return {'Attributes': dict(item)}
+            if ReturnValues in ('ALL_OLD', 'UPDATED_OLD') and existing:
+                return {'Attributes': dict(existing)}
+            return {}
+
+    def delete_item(self, Key, ConditionExpression=None, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues='NONE', **kwargs):
+        self._round_trip()
+        with self.lock:
+            key = Key[self.hash_key]
+            self._check(self.items.get(key), ConditionExpression, ExpressionAttributeNames,
+                        ExpressionAttributeValues, 'DeleteItem')
+            existing = self.items.pop(key, None)
+            self.writes += 1
+        if ReturnValues == 'ALL_OLD' and existing:
+            return {'Attributes': existing}
+        return {}
+
+    def batch_writer(self):
+        return _BatchWriter(self)
+
+    def _page(self, candidates, limit, start_key, key_of, filter_expression, names, values, projection,
+              sorted_keys=None):
+        start = 0
+        if start_key is not None and sorted_keys is not None:
+            start = bisect.bisect_right(sorted_keys, key_of(start_key))
+        elif start_key is not None:
+            keys = [key_of(item) for item in candidates]
+            start = keys.index(key_of(start_key)) + 1
+        page_size = min(filter(None, (limit, self.page_size)), default=None)
+        page = candidates[start:start + page_size] if page_size else candidates[start:]
+        response = {'ScannedCount': len(page)}
+        if page_size and start + page_size < len(candidates):
+            last = page[-1]
+            response['LastEvaluatedKey'] = {name: last[name] for name in key_of.attributes if name in last}
+        if filter_expression:
+            page = [item for item in page if _matches(filter_expression, names, values, item)]
+        if projection:
+            attributes = [self._resolve(name.strip(), names) for name in projection.split(',')]
+            page = [{name: item[name] for name in attributes if name in item} for item in page]
+        response['Items'] = [dict(item) for item in page]
+        response['Count'] = len(page)
+        return response
+
+    @staticmethod
+    def _resolve(name, names):
+        return (names or {}).get(name, name)
+
+    def scan(self, FilterExpression=None, ExpressionAttributeNames=None, ExpressionAttributeValues=None,
+             ProjectionExpression=None, Limit=None, ExclusiveStartKey=None, Segment=None,
+             TotalSegments=None, **kwargs):
+        self._round_trip()
+        candidates, keys = self._segment(Segment or 0, TotalSegments or 1)
+
+        def key_of(item):
+            return item[self.hash_key]
+        key_of.attributes = (self.hash_key,)
+        return self._page(candidates, Limit, ExclusiveStartKey, key_of, FilterExpression,
+                          ExpressionAttributeNames, ExpressionAttributeValues, ProjectionExpression, keys)
+
+    def _segment(self, segment, total_segments):
+        """
+        Items of one scan segment in key order, cached until the table changes
+        """
+        with self.lock:
+            version = (len(self.items), self.writes)
+            cached = self._segments.get((segment, total_segments))
+            if cached and cached[0] == version:
+                return cached[1], cached[2]
+            candidates = sorted(
+                (item for key, item in self.items.items() if hash(key) % total_segments == segment),
+                key=lambda item: item[self.hash_key]
+            )
+            keys = [item[self.hash_key] for item in candidates]
+            self._segments[(segment, total_segments)] = (version, candidates, keys)
+            return candidates, keys
+
+    def query(self, KeyConditionExpression, IndexName=None, FilterExpression=None,
+              ExpressionAttributeNames=None, ExpressionAttributeValues=None, ProjectionExpression=None,
+              Limit=None, ExclusiveStartKey=None, ScanIndexForward=True, **kwargs):
+        self._round_trip()
+        hash_attribute, range_attribute = self.indexes[IndexName] if IndexName else (self.hash_key, None)
+        with self.lock:
+            candidates = [item for item in self.items.values()
+                          if hash_attribute in item and (range_attribute is None or range_attribute in item)
+                          and _matches(KeyConditionExpression, ExpressionAttributeNames,
+                                       ExpressionAttributeValues, item)]
+        candidates.sort(key=lambda item: (item.get(range_attribute, ''), item[self.hash_key]),
+                        reverse=not ScanIndexForward)
+
+        def key_of(item):
+            return (item.get(range_attribute), item[self.hash_key])
+        key_of.attributes = tuple(name for name in (self.hash_key, hash_attribute, range_attribute) if name)
+        return self._page(candidates, Limit, ExclusiveStartKey, key_of, FilterExpression,
+                          ExpressionAttributeNames, ExpressionAttributeValues, ProjectionExpression)
+
+
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
+
+def _serialize(item):
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+def _deserialize(values):
+    return {key: _deserializer.deserialize(value) for key, value in (values or {}).items()}
+
+class _Meta:
+    def __init__(self, client):
+        self.client = client
+
+class FakeClient:
+    """
+    Low-level client exposing transact_write_items over FakeTable instances
+    """
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def transact_write_items(self, TransactItems, **kwargs):
+        with self.lock:
+            self.calls += 1
+        if self.resource.latency:
+            time.sleep(self.resource.latency)
+
+        operations = []
+        for transact_item in TransactItems:
+            (action, params), = transact_item.items()
+            table = self.resource.Table(params['TableName'])
+            if action == 'Put':
+                item = _deserialize(params['Item'])
+                key = item[table.hash_key]
+            else:
+                item = None
+                key = _deserialize(params['Key'])[table.hash_key]
+            operations.append((action, params, table, key, item))
+
+        # Lock every table involved (in a fixed order) so the transaction is all-or-nothing
+        tables = sorted({id(table): table for _, _, table, _, _ in operations}.values(), key=lambda t: t.name)
+        for table in tables:
+            table.lock.acquire()
+        try:
+            reasons = []
+            for action, params, table, key, item in operations:
+                condition = params.get('ConditionExpression')
+                names = params.get('ExpressionAttributeNames')
+                values = _deserialize(params.get('ExpressionAttributeValues'))
+                if condition and not _matches(condition, names, values, table.items.get(key) or {}):
+                    reasons.append({'Code': 'ConditionalCheckFailed', 'Message': 'The conditional request failed'})
+                else:
+                    reasons.append({'Code': 'None'})
+            if any(reason['Code'] != 'None' for reason in reasons):
+                raise ClientError({
+                    'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                    'CancellationReasons': reasons
+                }, 'TransactWriteItems')
+
+            for action, params, table, key, item in operations:
+                if action == 'Put':
+                    table.items[key] = _normalize(item)
+                elif action == 'Update':
+                    updated = dict(table.items.get(key) or {table.hash_key: key})
+                    _Expression(params['UpdateExpression'], params.get('ExpressionAttributeNames'),
+                                _deserialize(params.get('ExpressionAttributeValues'))).apply_update(updated)
+                    table.items[key] = updated
+                elif action == 'Delete':
+                    table.items.pop(key, None)
+                table.writes += 1
+        finally:
+            for table in reversed(tables):
+                table.lock.release()
+        return {}
+
+    def scan(self, TableName, ExpressionAttributeValues=None, ExclusiveStartKey=None, **kwargs):
+        table = self.resource.Table(TableName)
+        if ExpressionAttributeValues:
+            kwargs['ExpressionAttributeValues'] = _deserialize(ExpressionAttributeValues)
+        if ExclusiveStartKey:
+            kwargs['ExclusiveStartKey'] = _deserialize(ExclusiveStartKey)
+        response = table.scan(**kwargs)
+        response['Items'] = [_serialize(item) for item in response['Items']]
+        if 'LastEvaluatedKey' in response:
+            response['LastEvaluatedKey'] = _serialize(response['LastEvaluatedKey'])
+        return response
+
+class FakeDynamoDB:
+    """
+    Stand-in for boto3.resource('dynamodb')
+    """
+
+    def __init__(self, latency=0.0, **table_options):
+        self.latency = latency
+        self.table_options = table_options
+        self.tables = {}
+        self.meta = _Meta(FakeClient(self))
+        self.lock = threading.Lock()
+
+    def Table(self, name):
+        with self.lock:
+            if name not in self.tables:
+                self.tables[name] = FakeTable(name, latency=self.latency, **self.table_options)
+            return self.tables[name]
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        responses = {}
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            table._round_trip()
+            with table.lock:
+                responses[name] = [dict(table.items[key[table.hash_key]]) for key in request['Keys']
+                                   if key[table.hash_key] in table.items]
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    @property
+    def calls(self):
+        return self.meta.client.calls + sum(table.calls for table in self.tables.values())
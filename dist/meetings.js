@@ -820,8 +820,10 @@ function forceInputStyling() {
 // Load booked slots from API
 async function loadBookedSlots() {
     try {
+        // no-cache revalidates with If-None-Match, so unchanged availability comes back as a cheap 304
         const response = await fetch('https://dkmogwhqc8.execute-api.us-west-1.amazonaws.com/prod/availability', {
             method: 'GET',
+            cache: 'no-cache',
             headers: {
                 'Origin': window.location.origin
             }
@@ -1,33 +1,375 @@
+import builtins
+import os
+import sys
+import time
+
+# Import-time report mode (IMPORT_TIME_REPORT=1): time every module first imported
+# while the container initializes, and the lazy imports below on first use.
+# Read the report with the import-report maintenance task.
+IMPORT_TIME_REPORT = os.environ.get('IMPORT_TIME_REPORT', '').lower() in ('1', 'true', 'yes')
+_init_started = time.perf_counter()
+_import_times = {}  # module -> {'cumulativeMs', 'selfMs', 'phase'}
+_import_stack = []  # Time spent in nested imports, per open import
+_builtin_import = builtins.__import__
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """
+    builtins.__import__ wrapper recording how long each newly loaded module took
+    """
+    if level or name in sys.modules:
+        return _builtin_import(name, globals, locals, fromlist, level)
+    
+    _import_stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _builtin_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = _import_stack.pop()
+        if _import_stack:
+            _import_stack[-1] += elapsed
+        _import_times.setdefault(name, {
+            'cumulativeMs': round(elapsed * 1000, 3),
+            'selfMs': round((elapsed - nested) * 1000, 3),
+            'phase': 'init'
+        })
+
+if IMPORT_TIME_REPORT:
+    builtins.__import__ = _timed_import
+
 import json
 import boto3
 import uuid
 import re
 import html
 from datetime import datetime, timedelta
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
-import os
 import hashlib
-import time
-import jwt
-import requests
 from urllib.parse import urlparse
+import http.client
 import secrets
+import hmac
+import base64
+import csv
+import io
+import shutil
+import tempfile
+import zlib
+import gzip
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import random
+from types import MappingProxyType
+
+try:
+    import brotli  # Optional: enables 'br' response encoding when packaged with the function
+except ImportError:
+    brotli = None
+
+# Heavy modules only some routes need, imported on first use (see get_jwt/get_requests)
+_lazy_modules = {}
+
+# DynamoDB client tuning. Adaptive retries back off client-side once throttling starts
+# instead of hammering the table; short timeouts keep a stalled call from eating the
+# Lambda timeout.
+DYNAMODB_MAX_POOL_CONNECTIONS = int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', '16'))  # >= SCAN_SEGMENTS
+DYNAMODB_CONNECT_TIMEOUT = float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT', '1'))  # Seconds
+DYNAMODB_READ_TIMEOUT = float(os.environ.get('DYNAMODB_READ_TIMEOUT', '5'))  # Seconds
+DYNAMODB_RETRY_MODE = os.environ.get('DYNAMODB_RETRY_MODE', 'adaptive')  # 'adaptive', 'standard' or 'legacy'
+DYNAMODB_MAX_ATTEMPTS = int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '4'))  # Including the first call
+DYNAMODB_TCP_KEEPALIVE = os.environ.get('DYNAMODB_TCP_KEEPALIVE', 'true').lower() == 'true'
+
+# operation -> call counters, updated after every DynamoDB call
+_dynamodb_call_stats = {}
+_dynamodb_call_stats_lock = threading.Lock()
+THROTTLING_ERROR_CODES = frozenset(['ProvisionedThroughputExceededException', 'ThrottlingException',
+                                    'RequestLimitExceeded'])
+
+def build_dynamodb_config():
+    """
+    Build the botocore config shared by every DynamoDB table operation
+    """
+    return Config(
+        max_pool_connections=DYNAMODB_MAX_POOL_CONNECTIONS,
+        connect_timeout=DYNAMODB_CONNECT_TIMEOUT,
+        read_timeout=DYNAMODB_READ_TIMEOUT,
+        tcp_keepalive=DYNAMODB_TCP_KEEPALIVE,
+        retries={'mode': DYNAMODB_RETRY_MODE, 'total_max_attempts': DYNAMODB_MAX_ATTEMPTS}
+    )
+
+def start_call_timer(context, **kwargs):
+    """
+    botocore before-call hook: note when the call (including retries) started
+    """
+    context['call_started'] = time.perf_counter()
+
+def record_call_stats(context, event_name, parsed=None, exception=None, **kwargs):
+    """
+    botocore after-call / after-call-error hook: record latency, retries,
+    throttling and errors per operation (the last part of the event name)
+    """
+    started = context.get('call_started')
+    elapsed_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+    metadata = (parsed or {}).get('ResponseMetadata', {})
+    retries = metadata.get('RetryAttempts', 0)
+    error_code = (parsed or {}).get('Error', {}).get('Code')
+    
+    with _dynamodb_call_stats_lock:
+        stats = _dynamodb_call_stats.setdefault(event_name.rsplit('.', 1)[-1], {
+            'calls': 0,
+            'retries': 0,
+            'maxRetries': 0,
+            'throttled': 0,
+            'errors': 0,
+            'totalMs': 0.0,
+            'maxMs': 0.0
+        })
+        stats['calls'] += 1
+        stats['retries'] += retries
+        stats['maxRetries'] = max(stats['maxRetries'], retries)
+        stats['totalMs'] += elapsed_ms
+        stats['maxMs'] = max(stats['maxMs'], elapsed_ms)
+        if error_code in THROTTLING_ERROR_CODES:
+            stats['throttled'] += 1
+        if error_code or exception is not None:
+            stats['errors'] += 1
+
+def create_dynamodb_resource():
+    """
+    Create the DynamoDB resource with the tuned config and call stats hooks
+    """
+    resource = boto3.resource('dynamodb', config=build_dynamodb_config())
+    events = resource.meta.client.meta.events
+    events.register('before-call.dynamodb', start_call_timer)
+    events.register('after-call.dynamodb', record_call_stats)
+    events.register('after-call-error.dynamodb', record_call_stats)
+    return resource
+
+def get_dynamodb_call_stats():
+    """
+    Get per-operation DynamoDB call counters, with average latency
+    """
+    with _dynamodb_call_stats_lock:
+        return {
+            operation: dict(stats, totalMs=round(stats['totalMs'], 3), maxMs=round(stats['maxMs'], 3),
+                            avgMs=round(stats['totalMs'] / stats['calls'], 3) if stats['calls'] else 0.0)
+            for operation, stats in _dynamodb_call_stats.items()
+        }
 
 # Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb')
+dynamodb = create_dynamodb_resource()
 table_name = os.environ.get('DYNAMODB_TABLE', 'tes-connections')
 table = dynamodb.Table(table_name)
 
+# Rate limit counters live in their own table so submission scans never read them
+rate_limit_table_name = os.environ.get('RATE_LIMIT_TABLE', table_name)
+rate_limit_table = dynamodb.Table(rate_limit_table_name)
+
 # Security configuration
 MAX_REQUEST_SIZE = 1024 * 10  # 10KB max request size
 RATE_LIMIT_WINDOW = 300  # 5 minutes
 MAX_REQUESTS_PER_WINDOW = 5  # Max 5 requests per 5 minutes
-ALLOWED_ORIGINS = [
+LOCAL_RATE_LIMIT_BURST = int(os.environ.get('LOCAL_RATE_LIMIT_BURST', str(MAX_REQUESTS_PER_WINDOW * 2)))
+LOCAL_RATE_LIMIT_REFILL_RATE = MAX_REQUESTS_PER_WINDOW / RATE_LIMIT_WINDOW  # Tokens per second
+LOCAL_RATE_LIMIT_MAX_IPS = int(os.environ.get('LOCAL_RATE_LIMIT_MAX_IPS', '4096'))
+
+# Input validation patterns, compiled once per container
+UNSAFE_CHARS_PATTERN = re.compile(r'[<>"\']')
+CONTROL_CHARS_PATTERN = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+NAME_PATTERN = re.compile(r"^[a-zA-Z\s\-'\.]+$")
+
+# Warm the DynamoDB connection and the Cognito JWKS during container init (on by
+# default inside Lambda; off elsewhere so local scripts don't wait on the network)
+WARMUP_ON_INIT = os.environ.get('WARMUP_ON_INIT', '1' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else '0') == '1'
+WARMUP_TIMEOUT = float(os.environ.get('WARMUP_TIMEOUT', '3'))  # Seconds init waits for warmup (init is capped at 10s)
+
+# Meeting calendar, overridable with CALENDAR_CONFIG (JSON, same shape). Each event
+# lists its dates, bookable hours [startHour, endHour), slot length in minutes and
+# how many meetings a slot takes; slotCapacity overrides single slots.
+DEFAULT_CALENDAR_CONFIG = {
+    'events': [{
+        'id': 'dmexco-2025',
+        'dates': ['2025-09-17', '2025-09-18'],
+        'startHour': 9,
+        'endHour': 17,
+        'slotMinutes': 15,
+        'capacity': 1
+    }]
+}
+
+# Compiled calendar: every slot key in calendar order, plus lookups built once per container
+Calendar = namedtuple('Calendar', ['slots', 'slot_index', 'slot_capacity', 'slot_event', 'event_slots', 'dates',
+                                   'events'])
+
+def compile_calendar(config):
+    """
+    Expand a calendar config into slot keys ("2025-09-17-09:15") and the
+    lookup tables used by validation and availability. Raises ValueError
+    for malformed or overlapping events.
+    """
+    slots = []
+    slot_capacity = {}
+    slot_event = {}
+    event_slots = {}
+    dates = {}
+    events = []
+    for event in config.get('events', []):
+        if not isinstance(event, dict) or 'id' not in event or not isinstance(event.get('dates'), list):
+            raise ValueError(f"Calendar event needs an id and a list of dates: {event!r}")
+        event_id = str(event['id'])
+        slot_minutes = int(event.get('slotMinutes', 15))
+        start_minute = int(event.get('startHour', 9)) * 60
+        end_minute = int(event.get('endHour', 17)) * 60
+        capacity = int(event.get('capacity', 1))
+        if slot_minutes <= 0 or start_minute >= end_minute or capacity < 1:
+            raise ValueError(f"Invalid calendar event {event_id}")
+        if event_id in event_slots or '#' in event_id:
+            raise ValueError(f"Invalid or duplicate calendar event id {event_id}")
+        
+        first_slot = len(slots)
+        for date in event['dates']:
+            datetime.strptime(date, '%Y-%m-%d')
+            if date in dates:
+                raise ValueError(f"Calendar date {date} belongs to more than one event")
+            dates[date] = event_id
+            for minute in range(start_minute, end_minute, slot_minutes):
+                slot = f"{date}-{minute // 60:02d}:{minute % 60:02d}"
+                slots.append(slot)
+                slot_capacity[slot] = capacity
+                slot_event[slot] = event_id
+        
+        for slot, slot_override in event.get('slotCapacity', {}).items():
+            if slot_event.get(slot) != event_id:
+                raise ValueError(f"slotCapacity names unknown slot {slot}")
+            slot_override = int(slot_override)
+            if slot_override < 0:
+                raise ValueError(f"Negative slotCapacity for slot {slot}")
+            slot_capacity[slot] = slot_override
+        
+        event_slots[event_id] = tuple(slots[first_slot:])
+        events.append({
+            'id': event_id,
+            'dates': list(event['dates']),
+            'startHour': start_minute // 60,
+            'endHour': end_minute // 60,
+            'slotMinutes': slot_minutes
+        })
+    
+    return Calendar(
+        slots=tuple(slots),
+        slot_index={slot: index for index, slot in enumerate(slots)},
+        slot_capacity=slot_capacity,
+        slot_event=slot_event,
+        event_slots=event_slots,
+        dates=dates,
+        events=tuple(events)
+    )
+
+CALENDAR = compile_calendar(json.loads(os.environ['CALENDAR_CONFIG']) if os.environ.get('CALENDAR_CONFIG')
+                            else DEFAULT_CALENDAR_CONFIG)
+
+# Every bookable slot in calendar order; within an event, a slot's position is its bit in the availability bitmap
+AVAILABILITY_SLOTS = CALENDAR.slots
+SLOT_INDEX = CALENDAR.slot_index
+SLOT_CAPACITY = CALENDAR.slot_capacity
+
+# Requests without an eventId (path /events/<id>/..., ?eventId= or body) belong to the first event
+DEFAULT_EVENT_ID = CALENDAR.events[0]['id'] if CALENDAR.events else 'default'
+EVENT_IDS = frozenset(CALENDAR.event_slots) | {DEFAULT_EVENT_ID}
+EVENT_PATH_PATTERN = re.compile(r'/events/([^/]+)/')
+
+# Transactions on a busy slot can conflict; retry a few times with jitter before returning 429
+BOOKING_ATTEMPTS = 3
+BOOKING_RETRY_DELAY = 0.05  # Seconds, doubled per attempt
+
+# Availability and data version updates after a committed write are retried too. Ones
+# that still fail are repaired by later requests in the same container: a pending
+# version bump is retried before any ETag is served, and an event whose availability
+# item missed an update is read from its slot counters (and rewritten) instead.
+# Other containers don't know about the failure, so every container also checks each
+# event's availability item against its slot counters every AVAILABILITY_RECHECK_INTERVAL.
+PUBLISH_ATTEMPTS = 3
+AVAILABILITY_RECHECK_INTERVAL = int(os.environ.get('AVAILABILITY_RECHECK_INTERVAL', '300'))  # Seconds; 0 disables
+_publish_state = {'pending_bump': False, 'stale_availability': set(), 'checked_at': {}}
+_publish_stats = {'availabilityFailures': 0, 'versionFailures': 0, 'repairs': 0, 'lastError': None}
+
+# Per-event item (<eventId>#availability) holding a booked count per slot, adjusted after every booking/delete
+AVAILABILITY_KEY = 'availability'
+
+# Counter bumped on every submit/delete; read endpoints derive their ETag from it
+DATA_VERSION_KEY = 'data_version'
+
+# Submissions carry listKey <eventId>#submission, so the sparse createdAt index holds only
+# submissions and each event's are one partition of it. 'submission' alone predates events.
+SUBMISSION_LIST_KEY = 'submission'
+SUBMISSIONS_INDEX = os.environ.get('SUBMISSIONS_INDEX', 'ListKeyCreatedAtIndex')
+ADMIN_PAGE_SIZE = 50
+MAX_ADMIN_PAGE_SIZE = 500
+
+# Deleted submissions leave a tombstone (listKey <eventId>#tombstone) in the same index so
+# /admin-data?since= can report them
+TOMBSTONE_LIST_KEY = 'tombstone'
+TOMBSTONE_PREFIX = 'tombstone#'
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', '30'))
+DELTA_SYNC_OVERLAP = 30  # Seconds re-read before the watermark to cover in-flight writes and index lag
+
+# Parallel scan configuration (full exports and maintenance tasks)
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '4'))
+
+# Admin export configuration
+EXPORT_INLINE_LIMIT = int(os.environ.get('EXPORT_INLINE_LIMIT', str(4 * 1024 * 1024)))  # Gzipped bytes; stays under the 6MB Lambda payload after base64
+EXPORT_BUCKET = os.environ.get('EXPORT_BUCKET', '')  # Larger exports are spilled here and served by presigned URL
+EXPORT_SPILL_DIR = os.environ.get('EXPORT_SPILL_DIR', '')  # Local filesystem stand-in for EXPORT_BUCKET
+EXPORT_URL_TTL = 15 * 60  # Presigned URLs are valid for 15 minutes
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson'
+}
+EXPORT_CSV_COLUMNS = (
+    ('ID', 'id'),
+    ('Name', 'name'),
+    ('Communication', 'communication'),
+    ('Contact Details', 'info'),
+    ('Meeting Time', 'timeSlot'),
+    ('Comments', 'comments'),
+    ('Submitted', 'timestamp'),
+    ('Type', 'type')
+)
+
+# Response compression configuration
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))  # Bodies smaller than this are sent as-is
+COMPRESSION_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Per-route compression counters, kept for the life of the container
+_compression_stats = {}
+
+# Live dashboard counters per event (<eventId>#aggregates), maintained from the table's DynamoDB stream
+AGGREGATES_KEY = 'aggregates'
+STREAM_EVENT_PREFIX = 'streamevent#'
+STREAM_EVENT_TTL = 48 * 60 * 60  # Outlives the 24h stream retention, so any redelivered record is recognized
+AGGREGATE_GROUPS = {
+    'type': 'byType',
+    'day': 'byDay',
+    'channel': 'byChannel',
+    'meetingDay': 'meetingsByDay'
+}
+
+# Key prefixes of bookkeeping items that share the table with submissions. Event-scoped
+# keys (<eventId>#...) are bookkeeping too; submission ids are UUIDs and never contain '#'.
+INTERNAL_KEY_PREFIXES = ('rate_limit', 'slot#', AVAILABILITY_KEY, DATA_VERSION_KEY, TOMBSTONE_PREFIX,
+                         AGGREGATES_KEY, STREAM_EVENT_PREFIX)
+ALLOWED_ORIGINS = frozenset([
     'https://main.dbovg7p76124l.amplifyapp.com',
     'https://tesconnections.com',
     'http://localhost:8000',
     'http://127.0.0.1:8000'
-]
+])
+DEFAULT_ORIGIN = 'https://tesconnections.com'  # Sent to origins that aren't allowed
 
 # API Key configuration
 FORM_API_KEY = os.environ.get('FORM_API_KEY', 'tes_XNuYmTQIhSA1385VaEVnfg6kRKu8TufODDYPyhazkNUzERNn673BVAkaizM9wVyl')
@@ -41,47 +383,253 @@ ADMIN_PIN = os.environ.get('ADMIN_PIN', '1954')  # Set this in Lambda environmen
 PIN_SESSION_SECRET = os.environ.get('PIN_SESSION_SECRET', 'nhacN0t9q78INslG3r0eg6aa2URUQO2gIpxda4IZOmU=')
 PIN_SESSION_DURATION = 24 * 60 * 60  # 24 hours in seconds
 
+# Signs admin pagination cursors
+CURSOR_SECRET = os.environ.get('CURSOR_SECRET', PIN_SESSION_SECRET)
+
+# JWKS cache configuration
+JWKS_CACHE_TTL = int(os.environ.get('JWKS_CACHE_TTL', '3600'))  # Refetch keys after 1 hour
+JWKS_MIN_REFRESH_INTERVAL = int(os.environ.get('JWKS_MIN_REFRESH_INTERVAL', '60'))  # At most one fetch per minute
+JWKS_NEGATIVE_CACHE_TTL = int(os.environ.get('JWKS_NEGATIVE_CACHE_TTL', '300'))  # Remember unknown kids for 5 minutes
+JWKS_NEGATIVE_CACHE_SIZE = 1024
+JWKS_FETCHER = os.environ.get('JWKS_FETCHER', 'stdlib')  # 'stdlib' (http.client keep-alive) or 'requests'
+JWKS_CONNECT_TIMEOUT = float(os.environ.get('JWKS_CONNECT_TIMEOUT', '2'))  # Seconds
+JWKS_READ_TIMEOUT = float(os.environ.get('JWKS_READ_TIMEOUT', '3'))  # Seconds
+JWKS_MAX_SIZE = 256 * 1024  # A JWKS is a few KB; refuse anything far larger
+COGNITO_JWKS_URL = f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json'
+
+# Parsed Cognito public keys, kept for the lifetime of the container
+_jwks_cache = {
+    'keys': {},          # kid -> public key object
+    'fetched_at': 0,     # time of last successful fetch
+    'last_attempt': 0,   # time of last fetch attempt (successful or not)
+    'unknown_kids': {}   # kid -> time it was last looked up and not found
+}
+
+# Keep-alive connection to the JWKS host, reused across warm invocations
+_jwks_connection = {'conn': None, 'origin': None}
+_jwks_connection_lock = threading.Lock()
+
+# Verified token cache configuration
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '256'))
+
+# Bumping the epoch invalidates every cached token in this container (key rotation)
+_auth_epoch = {'value': 0}
+
+# sha256(token) -> (claims, exp, epoch), least recently used first
+_token_cache = OrderedDict()
+_token_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+def import_lazy(name):
+    """
+    Import a deferred module on first use, recording the time in the import
+    report when report mode is on
+    """
+    module = _lazy_modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        loaded = name in sys.modules
+        module = _lazy_modules[name] = __import__(name)
+        if IMPORT_TIME_REPORT and not loaded:
+            elapsed = round((time.perf_counter() - start) * 1000, 3)
+            _import_times.setdefault(name, {'cumulativeMs': elapsed, 'selfMs': elapsed, 'phase': 'lazy'})
+    return module
+
+def get_jwt():
+    """
+    PyJWT (and cryptography), needed only to issue and verify admin tokens
+    """
+    return import_lazy('jwt')
+
+def get_requests():
+    """
+    requests (with urllib3, idna, charset_normalizer and certifi), needed only
+    to fetch the Cognito JWKS when JWKS_FETCHER=requests
+    """
+    return import_lazy('requests')
+
+def get_import_report():
+    """
+    Get the import-time report: container init time and the slowest
+    module imports (cumulative, including nested imports)
+    """
+    if not IMPORT_TIME_REPORT:
+        return {'enabled': False, 'message': 'Set IMPORT_TIME_REPORT=1 to record import times'}
+    
+    modules = sorted(_import_times.items(), key=lambda entry: entry[1]['cumulativeMs'], reverse=True)
+    return {
+        'enabled': True,
+        'initMs': _init_ms,
+        'modules': [dict(timing, module=name) for name, timing in modules[:50]]
+    }
+
+def close_jwks_connection():
+    """
+    Drop the kept-alive JWKS connection
+    """
+    conn = _jwks_connection['conn']
+    _jwks_connection['conn'] = None
+    if conn is not None:
+        conn.close()
+
+def get_jwks_connection(parsed_url):
+    """
+    Get the kept-alive connection for a JWKS URL, opening one if needed.
+    Returns (connection, reused).
+    """
+    origin = (parsed_url.scheme, parsed_url.netloc)
+    if _jwks_connection['conn'] is not None and _jwks_connection['origin'] == origin:
+        return _jwks_connection['conn'], True
+    
+    close_jwks_connection()
+    connection_class = http.client.HTTPConnection if parsed_url.scheme == 'http' else http.client.HTTPSConnection
+    conn = connection_class(parsed_url.netloc, timeout=JWKS_CONNECT_TIMEOUT)
+    conn.connect()
+    conn.sock.settimeout(JWKS_READ_TIMEOUT)
+    _jwks_connection.update(conn=conn, origin=origin)
+    return conn, False
+
+def fetch_jwks_stdlib(url):
+    """
+    Fetch a JWKS with http.client over a kept-alive connection. A request on
+    a reused connection that the server has since closed is retried once on
+    a fresh one.
+    """
+    parsed = urlparse(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+    with _jwks_connection_lock:
+        for attempt in range(2):
+            conn, reused = get_jwks_connection(parsed)
+            try:
+                conn.request('GET', path, headers={'Accept': 'application/json'})
+                response = conn.getresponse()
+                body = response.read(JWKS_MAX_SIZE + 1)
+            except (http.client.HTTPException, OSError):
+                close_jwks_connection()
+                if reused and attempt == 0:
+                    continue
+                raise
+            
+            if response.will_close or len(body) > JWKS_MAX_SIZE:
+                close_jwks_connection()
+            if response.status != 200:
+                raise ValueError(f"JWKS request failed with status {response.status}")
+            if len(body) > JWKS_MAX_SIZE:
+                raise ValueError("JWKS response too large")
+            return json.loads(body)
+
+def fetch_jwks_requests(url):
+    """
+    Fetch a JWKS with requests (imported on first use)
+    """
+    response = get_requests().get(url, timeout=(JWKS_CONNECT_TIMEOUT, JWKS_READ_TIMEOUT))
+    response.raise_for_status()
+    return response.json()
+
+JWKS_FETCHERS = {
+    'stdlib': fetch_jwks_stdlib,
+    'requests': fetch_jwks_requests,
+}
+
 def get_cognito_public_keys():
     """
     Get Cognito public keys for JWT verification
     """
     try:
-        url = f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json'
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        fetch_jwks = JWKS_FETCHERS.get(JWKS_FETCHER, fetch_jwks_stdlib)
+        return fetch_jwks(COGNITO_JWKS_URL)
     except Exception as e:
         return None
 
-def verify_jwt_token(token):
+def refresh_cognito_public_keys():
+    """
+    Fetch the Cognito JWKS and replace the cached kid -> public key map
+    """
+    _jwks_cache['last_attempt'] = time.time()
+    
+    jwks = get_cognito_public_keys()
+    if not jwks:
+        # Keep serving the previous keys if the fetch failed
+        return False
+    
+    jwt = get_jwt()
+    keys = {}
+    for key in jwks.get('keys', []):
+        key_id = key.get('kid')
+        if not key_id:
+            continue
+        try:
+            keys[key_id] = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
+        except Exception:
+            continue
+    
+    # Keys disappearing from the JWKS means a rotation: drop cached tokens
+    if _jwks_cache['keys'].keys() - keys.keys():
+        bump_auth_epoch()
+    
+    _jwks_cache['keys'] = keys
+    _jwks_cache['fetched_at'] = _jwks_cache['last_attempt']
+    for key_id in keys:
+        _jwks_cache['unknown_kids'].pop(key_id, None)
+    return True
+
+def get_cognito_public_key(key_id):
+    """
+    Get the parsed public key for a key ID, refetching the JWKS only when
+    the cache has expired or the kid is unknown (and not negatively cached)
+    """
+    now = time.time()
+    refresh_allowed = now - _jwks_cache['last_attempt'] >= JWKS_MIN_REFRESH_INTERVAL
+    
+    fetched = False  # Only a successful fetch proves a kid unknown
+    if now - _jwks_cache['fetched_at'] >= JWKS_CACHE_TTL and refresh_allowed:
+        fetched = refresh_cognito_public_keys()
+        refresh_allowed = False
+    
+    public_key = _jwks_cache['keys'].get(key_id)
+    if public_key is not None:
+        return public_key
+    
+    # Unknown kid: refetch once, unless we recently failed to find it
+    unknown_kids = _jwks_cache['unknown_kids']
+    missed_at = unknown_kids.get(key_id)
+    if missed_at is not None and now - missed_at < JWKS_NEGATIVE_CACHE_TTL:
+        return None
+    
+    if refresh_allowed:
+        fetched = refresh_cognito_public_keys()
+        public_key = _jwks_cache['keys'].get(key_id)
+    
+    if public_key is None and fetched:
+        if len(unknown_kids) >= JWKS_NEGATIVE_CACHE_SIZE:
+            unknown_kids.clear()
+        unknown_kids[key_id] = now
+    
+    return public_key
+
+def verify_jwt_token(token, unverified_header=None):
     """
     Verify JWT token from Cognito
     """
+    jwt = get_jwt()
     try:
         # Remove 'Bearer ' prefix if present
         if token.startswith('Bearer '):
             token = token[7:]
         
-        # Get public keys
-        public_keys = get_cognito_public_keys()
-        if not public_keys:
-            return False, "Unable to verify token"
-        
-        # Decode token header to get key ID
-        unverified_header = jwt.get_unverified_header(token)
+        # Decode token header to get key ID (unless the caller already did)
+        if unverified_header is None:
+            unverified_header = jwt.get_unverified_header(token)
         key_id = unverified_header.get('kid')
         
         if not key_id:
             return False, "Invalid token header"
         
-        # Find the correct public key
-        public_key = None
-        for key in public_keys['keys']:
-            if key['kid'] == key_id:
-                public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
-                break
+        # Find the correct public key (cached across warm invocations)
+        public_key = get_cognito_public_key(key_id)
         
         if not public_key:
+            if not _jwks_cache['keys']:
+                return False, "Unable to verify token"
             return False, "Public key not found"
         
         # Verify and decode the token
@@ -107,6 +655,7 @@ def verify_pin_token(token):
     """
     Verify PIN-based session token
     """
+    jwt = get_jwt()
     try:
         # Remove 'Bearer ' prefix if present
         if token.startswith('Bearer '):
@@ -146,7 +695,7 @@ def generate_pin_session_token():
         'jti': str(uuid.uuid4())  # Unique token ID
     }
     
-    token = jwt.encode(payload, PIN_SESSION_SECRET, algorithm='HS256')
+    token = get_jwt().encode(payload, PIN_SESSION_SECRET, algorithm='HS256')
     return token
 
 def authenticate_pin(pin):
@@ -159,12 +708,88 @@ def authenticate_pin(pin):
     else:
         return False, "Invalid PIN"
 
-def is_admin_endpoint(path):
+def bump_auth_epoch():
+    """
+    Invalidate all cached token verifications
+    """
+    _auth_epoch['value'] += 1
+    _token_cache.clear()
+
+def get_token_cache_stats():
+    """
+    Get hit/miss counters for the verified token cache
+    """
+    return dict(_token_cache_stats, size=len(_token_cache))
+
+def get_cached_token_claims(token_digest):
+    """
+    Look up previously verified claims for a token digest
+    """
+    entry = _token_cache.get(token_digest)
+    if entry is None:
+        _token_cache_stats['misses'] += 1
+        return None
+    
+    claims, expires_at, epoch = entry
+    if epoch != _auth_epoch['value'] or time.time() >= expires_at:
+        del _token_cache[token_digest]
+        _token_cache_stats['misses'] += 1
+        return None
+    
+    _token_cache.move_to_end(token_digest)
+    _token_cache_stats['hits'] += 1
+    return claims
+
+def cache_token_claims(token_digest, claims):
+    """
+    Remember verified claims until the token's own expiry
+    """
+    expires_at = claims.get('exp')
+    if not isinstance(expires_at, (int, float)):
+        return
+    
+    _token_cache[token_digest] = (claims, expires_at, _auth_epoch['value'])
+    _token_cache.move_to_end(token_digest)
+    while len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+        _token_cache_stats['evictions'] += 1
+
+def verify_admin_token(token):
     """
-    Check if the request is for an admin endpoint
+    Verify an admin token, dispatching on its unverified header so PIN
+    session tokens (HS256) and Cognito tokens (RS256 + kid) only go through
+    their own verifier. Unknown algorithms are rejected before any crypto or I/O.
     """
-    admin_paths = ['/admin-data', '/delete-submission']
-    return any(path.endswith(admin_path) for admin_path in admin_paths)
+    if not isinstance(token, str):
+        return False, "Invalid token"
+    
+    # Remove 'Bearer ' prefix if present
+    if token.startswith('Bearer '):
+        token = token[7:]
+    
+    # Repeat calls with an already verified token skip signature checks
+    token_digest = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    claims = get_cached_token_claims(token_digest)
+    if claims is not None:
+        return True, claims
+    
+    jwt = get_jwt()
+    try:
+        unverified_header = jwt.get_unverified_header(token)
+    except jwt.InvalidTokenError as e:
+        return False, f"Invalid token: {str(e)}"
+    
+    algorithm = unverified_header.get('alg')
+    if algorithm == 'HS256':
+        is_valid, result = verify_pin_token(token)
+    elif algorithm == 'RS256' and unverified_header.get('kid'):
+        is_valid, result = verify_jwt_token(token, unverified_header)
+    else:
+        return False, "Unsupported token type"
+    
+    if is_valid:
+        cache_token_claims(token_digest, result)
+    return is_valid, result
 
 def validate_api_key(event):
     """
@@ -183,40 +808,21 @@ def validate_api_key(event):
 
 def validate_admin_access(event):
     """
-    Validate admin access for protected endpoints
+    Validate admin access for protected endpoints (routes with auth='admin')
     """
-    if not is_admin_endpoint(event.get('path', '')):
-        return True, None
-    
     # Check for Authorization header
-    headers = event.get('headers', {})
-    auth_header = headers.get('Authorization') or headers.get('authorization')
+    headers = event.get('headers', {}) or {}
+    token = headers.get('Authorization') or headers.get('authorization')
 
     # Fallback: allow token in query string to avoid CORS preflight (e.g., ?token=...)
-    if not auth_header:
+    if not token:
         qs = event.get('queryStringParameters') or {}
-        query_token = None
         if isinstance(qs, dict):
-            query_token = qs.get('token') or qs.get('auth') or qs.get('authorization')
-        if query_token:
-            # Try PIN authentication first
-            is_valid, result = verify_pin_token(query_token)
-            if is_valid:
-                return True, result
-            # Fallback to Cognito JWT verification
-            is_valid, result = verify_jwt_token(query_token)
-            if is_valid:
-                return True, result
-        else:
+            token = qs.get('token') or qs.get('auth') or qs.get('authorization')
+        if not token:
             return False, "Authorization header missing"
     
-    # Try PIN authentication first
-    is_valid, result = verify_pin_token(auth_header)
-    if is_valid:
-        return True, result
-    
-    # Fallback to Cognito JWT verification
-    is_valid, result = verify_jwt_token(auth_header)
+    is_valid, result = verify_admin_token(token)
     if is_valid:
         return True, result
     
@@ -236,10 +842,10 @@ def sanitize_input(text, max_length=1000):
     text = html.escape(text.strip())
     
     # Remove potentially dangerous characters
-    text = re.sub(r'[<>"\']', '', text)
+    text = UNSAFE_CHARS_PATTERN.sub('', text)
     
     # Remove control characters
-    text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
+    text = CONTROL_CHARS_PATTERN.sub('', text)
     
     return text
 
@@ -254,7 +860,7 @@ def validate_name(name):
         return False, "Name must be less than 100 characters"
     
     # Only allow letters, spaces, hyphens, apostrophes, and periods
-    if not re.match(r"^[a-zA-Z\s\-'\.]+$", name):
+    if not NAME_PATTERN.match(name):
         return False, "Name contains invalid characters"
     
     return True, ""
@@ -268,572 +874,1809 @@ def validate_communication(method):
 
 def validate_time_slot(time_slot):
     """
-    Validate that timeSlot is within allowed dates
+    Validate that timeSlot is a bookable slot in the calendar
     """
     if not time_slot:
         return True, ""  # timeSlot is optional
     
-    try:
-        # Parse the custom format "YYYY-MM-DD-HH:MM"
-        if '-' in time_slot and ':' in time_slot:
-            parts = time_slot.split('-')
-            if len(parts) >= 4:
-                year, month, day, time = parts[0], parts[1], parts[2], parts[3]
-                booking_date = datetime(int(year), int(month), int(day))
-                
-                # Check if date is in allowed range (September 17-18, 2025)
-                allowed_dates = [
-                    datetime(2025, 9, 17),
-                    datetime(2025, 9, 18)
-                ]
-                
-                if booking_date not in allowed_dates:
-                    return False, "Booking date not available. Only September 17-18, 2025 are available."
-                    
-                # Validate time format
-                if ':' in time:
-                    hour, minute = time.split(':')
-                    hour_int = int(hour)
-                    minute_int = int(minute)
-                    
-                    # Check if time is within business hours (9 AM - 5 PM)
-                    if hour_int < 9 or hour_int >= 17:
-                        return False, "Booking time must be between 9:00 AM and 5:00 PM"
-                    
-                    # Check if minute is valid (15-minute intervals)
-                    if minute_int not in [0, 15, 30, 45]:
-                        return False, "Booking time must be in 15-minute intervals"
-                        
+    if not isinstance(time_slot, str):
+        return False, "Invalid time slot format: expected YYYY-MM-DD-HH:MM"
+    
+    # Valid slots are exactly the compiled slot keys, so this is one hash lookup
+    if time_slot in SLOT_INDEX:
         return True, ""
-    except (ValueError, IndexError) as e:
-        return False, f"Invalid time slot format: {str(e)}"
-    except Exception as e:
-        return False, f"Error validating time slot: {str(e)}"
+    
+    # Only failures pay for working out a helpful message
+    if len(time_slot) != 16 or time_slot[10] != '-':
+        return False, "Invalid time slot format: expected YYYY-MM-DD-HH:MM"
+    if time_slot[:10] not in CALENDAR.dates:
+        return False, f"Booking date not available. Available dates: {', '.join(sorted(CALENDAR.dates))}."
+    
+    event = next(event for event in CALENDAR.events if event['id'] == CALENDAR.dates[time_slot[:10]])
+    return False, (f"Booking time must be between {event['startHour']}:00 and {event['endHour']}:00 "
+                   f"in {event['slotMinutes']}-minute intervals")
 
-def check_time_slot_availability(time_slot):
+def get_event_key(event_id, name):
     """
-    Check if a time slot is already booked
+    Get the key of an event-scoped item or index partition,
+    e.g. 'dmexco-2025#submission'
     """
-    if not time_slot:
-        return True, ""  # No time slot means no conflict
+    return f"{event_id}#{name}"
+
+def get_slot_key(time_slot):
+    """
+    Get the key of the counter item for a time slot (slots belong to
+    exactly one event)
+    """
+    return get_event_key(CALENDAR.slot_event.get(time_slot, DEFAULT_EVENT_ID), f"slot#{time_slot}")
+
+def is_internal_key(key):
+    """
+    Check whether an item key belongs to a bookkeeping item rather than a submission
+    """
+    return key.startswith(INTERNAL_KEY_PREFIXES) or '#' in key
+
+def is_submission(item):
+    """
+    Check whether a stored item is a submission (listKey 'submission' or '<eventId>#submission')
+    """
+    list_key = (item or {}).get('listKey') or ''
+    return list_key == SUBMISSION_LIST_KEY or list_key.endswith(f"#{SUBMISSION_LIST_KEY}")
+
+def get_submission_event_id(item):
+    """
+    Get the event a stored submission belongs to; submissions stored before
+    events existed belong to the default event
+    """
+    return item.get('eventId') or DEFAULT_EVENT_ID
+
+def get_request_event_id(event, body=None):
+    """
+    Get the eventId of a request from the path (/events/<id>/...), the
+    query string or the JSON body, defaulting to DEFAULT_EVENT_ID
+    """
+    match = EVENT_PATH_PATTERN.search(event.get('path') or '')
+    if match:
+        return match.group(1)
+    qs = event.get('queryStringParameters') or {}
+    if qs.get('eventId'):
+        return qs['eventId']
+    if isinstance(body, dict) and body.get('eventId'):
+        return str(body['eventId'])
+    return DEFAULT_EVENT_ID
+
+def build_slot_counter_update(time_slot, delta):
+    """
+    Build the transaction operation that moves a slot's booked counter by
+    delta (+1 to book, -1 to release). Bookings only succeed while the slot
+    is below capacity and releases while the counter is positive, so the
+    counter can never leave [0, capacity].
+    """
+    if delta > 0:
+        condition = 'attribute_not_exists(#booked) OR #booked < :limit'
+        limit = SLOT_CAPACITY.get(time_slot, 1)
+    else:
+        condition = '#booked > :limit'
+        limit = 0
     
-    try:
-        # Query DynamoDB to check if this time slot is already booked
-        response = table.scan(
-            FilterExpression='timeSlot = :time_slot',
-            ExpressionAttributeValues={
+    return {
+        'Update': {
+            'TableName': table_name,
+            'Key': serialize_item({'id': get_slot_key(time_slot)}),
+            'UpdateExpression': 'ADD #booked :delta SET #timeSlot = :time_slot',
+            'ConditionExpression': condition,
+            'ExpressionAttributeNames': {'#booked': 'booked', '#timeSlot': 'timeSlot'},
+            'ExpressionAttributeValues': serialize_item({
+                ':delta': delta,
+                ':limit': limit,
                 ':time_slot': time_slot
-            }
-        )
-        
-        # If any items are found, the time slot is already booked
-        if response.get('Items'):
-            return False, f"Time slot {time_slot} is already booked. Please choose a different time."
-        
-        return True, ""
-    except Exception as e:
-        # If we can't check availability, allow the booking
-        return True, ""
+            })
+        }
+    }
 
-def get_client_ip(event):
+# TransactWriteItems and parallel scans go through the low-level client, which uses typed attribute values
+_type_serializer = TypeSerializer()
+_type_deserializer = TypeDeserializer()
+
+# Cancellation reason codes that mean "try again" rather than "conflict"
+RETRYABLE_CANCELLATION_CODES = ('TransactionConflict', 'ThrottlingError', 'ProvisionedThroughputExceeded')
+
+def serialize_item(item):
     """
-    Extract client IP address from event
+    Convert a plain item into DynamoDB AttributeValue format
     """
-    try:
-        return event.get('requestContext', {}).get('identity', {}).get('sourceIp', 'unknown')
-    except:
-        return 'unknown'
+    return {key: _type_serializer.serialize(value) for key, value in item.items()}
 
-def check_rate_limit(ip_address):
+def deserialize_item(item):
+    """
+    Convert an item in DynamoDB AttributeValue format into plain values
     """
-    Simple rate limiting using DynamoDB
+    return {key: _type_deserializer.deserialize(value) for key, value in item.items()}
+
+# Marks a finished segment on the parallel scan queue
+_SCAN_SEGMENT_DONE = object()
+
+def parallel_scan(projection=None, filter_expression=None, expression_attribute_names=None,
+                  expression_attribute_values=None, total_segments=None):
     """
+    Scan the whole table using Segment/TotalSegments across a thread pool,
+    following LastEvaluatedKey within each segment. Yields items as pages
+    arrive (in no particular order) so callers can stream large tables.
+    """
+    total_segments = max(1, total_segments or SCAN_SEGMENTS)
+    client = dynamodb.meta.client  # Clients are thread-safe, Table resources are not
+    pages = queue.Queue(maxsize=total_segments * 2)
+    stop = threading.Event()
+    
+    base_kwargs = {'TableName': table_name, 'TotalSegments': total_segments}
+    if projection:
+        base_kwargs['ProjectionExpression'] = projection
+    if filter_expression:
+        base_kwargs['FilterExpression'] = filter_expression
+    if expression_attribute_names:
+        base_kwargs['ExpressionAttributeNames'] = expression_attribute_names
+    if expression_attribute_values:
+        base_kwargs['ExpressionAttributeValues'] = serialize_item(expression_attribute_values)
+    
+    def put(page):
+        # Give up if the consumer went away, instead of blocking forever
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def scan_segment(segment):
+        scan_kwargs = dict(base_kwargs, Segment=segment)
+        try:
+            while not stop.is_set():
+                response = client.scan(**scan_kwargs)
+                if not put(response.get('Items', [])):
+                    return
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            put(e)
+        finally:
+            put(_SCAN_SEGMENT_DONE)
+    
+    executor = ThreadPoolExecutor(max_workers=total_segments)
     try:
-        # Create a simple rate limit key
-        rate_key = f"rate_limit_{ip_address}_{int(time.time() // RATE_LIMIT_WINDOW)}"
-        
-        # Check if this IP has exceeded the limit
-        response = table.get_item(Key={'id': rate_key})
-        
-        if 'Item' in response:
-            request_count = response['Item'].get('count', 0)
-            if request_count >= MAX_REQUESTS_PER_WINDOW:
-                return False, "Rate limit exceeded. Please try again later."
-            
-            # Increment counter
-            table.update_item(
-                Key={'id': rate_key},
-                UpdateExpression='SET #count = #count + :inc',
-                ExpressionAttributeNames={'#count': 'count'},
-                ExpressionAttributeValues={':inc': 1}
-            )
-        else:
-            # First request in this window
-            table.put_item(Item={
-                'id': rate_key,
-                'count': 1,
-                'ttl': int(time.time()) + (RATE_LIMIT_WINDOW * 2)  # Auto-delete after 2 windows
-            })
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
         
-        return True, ""
-    except Exception as e:
-        # Allow request if rate limiting fails
-        return True, ""
+        finished = 0
+        while finished < total_segments:
+            page = pages.get()
+            if page is _SCAN_SEGMENT_DONE:
+                finished += 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                for item in page:
+                    yield deserialize_item(item)
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
 
-def get_cors_headers(origin):
+def build_submission_transaction(item):
     """
-    Get CORS headers based on origin
+    Build the TransactWriteItems operations that store a submission and
+    take one place in its time slot
     """
-    # Default CORS headers - restricted to allowed origins only
-    default_headers = {
-        'Content-Type': 'application/json',
-        'Access-Control-Allow-Origin': 'https://tesconnections.com',  # Default to main domain
-        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-        'Access-Control-Max-Age': '86400'
-    }
+    transact_items = [{
+        'Put': {
+            'TableName': table_name,
+            'Item': serialize_item(item),
+            'ConditionExpression': 'attribute_not_exists(id)'
+        }
+    }]
     
-    # If we have a specific origin and it's in our allowed list, use it
-    if origin and origin in ALLOWED_ORIGINS:
-        default_headers['Access-Control-Allow-Origin'] = origin
-        return default_headers
+    if item.get('timeSlot'):
+        transact_items.append(build_slot_counter_update(item['timeSlot'], 1))
     
-    # Log unauthorized origin attempt (without exposing allowed origins)
+    return transact_items
+
+def build_deletion_transaction(submission_id, event_id, time_slot=None):
+    """
+    Build the TransactWriteItems operations that delete a submission, give
+    its place in the time slot back and leave a tombstone for delta sync
+    """
+    deleted_at = datetime.utcnow()
+    tombstone = {
+        'id': f"{TOMBSTONE_PREFIX}{submission_id}",
+        'listKey': get_event_key(event_id, TOMBSTONE_LIST_KEY),
+        'submissionId': submission_id,
+        'createdAt': deleted_at.isoformat(),
+        'ttl': int((deleted_at + timedelta(days=TOMBSTONE_RETENTION_DAYS)).timestamp())
+    }
     
-    # Return restricted headers for unauthorized origins
-    return default_headers
+    transact_items = [{
+        'Delete': {
+            'TableName': table_name,
+            'Key': serialize_item({'id': submission_id}),
+            'ConditionExpression': 'attribute_exists(id)'
+        }
+    }]
+    if time_slot:
+        transact_items.append(build_slot_counter_update(time_slot, -1))
+    transact_items.append({
+        'Put': {
+            'TableName': table_name,
+            'Item': serialize_item(tombstone)
+        }
+    })
+    return transact_items
 
-def get_admin_data():
+def adjust_availability(time_slot, delta):
     """
-    Retrieve all form submissions for admin dashboard
+    Move a slot's count in the availability item. This runs after the
+    booking transaction rather than inside it, so bookings for different
+    slots never conflict on this one item; the slot counters stay
+    authoritative and rebuild-availability repairs any drift.
     """
-    try:
-        # Scan DynamoDB table to get all items
-        response = table.scan()
-        items = response.get('Items', [])
-        
-        # Process items to match admin dashboard format
-        submissions = []
-        for item in items:
-            # Skip rate limit entries
-            item_id = item.get('id', '')
-            if item_id.startswith('rate_limit'):
-                continue
-                
-            # Determine type based on whether it has a meeting time
-            time_slot = item.get('timeSlot')
-            submission_type = 'meeting' if time_slot else 'connection'
-            
-            submission = {
-                'id': item_id,
-                'name': item['name'],
-                'communication': item['communication'],
-                'info': item.get('info', ''),
-                'comments': item.get('comments', ''),
-                'timeSlot': time_slot,
-                'timestamp': item['createdAt'],
-                'type': submission_type
-            }
-            submissions.append(submission)
-        
-        # Sort by creation date (newest first)
-        submissions.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        return submissions
-        
-    except Exception as e:
-        return []
+    table.update_item(
+        Key={'id': get_event_key(CALENDAR.slot_event[time_slot], AVAILABILITY_KEY)},
+        UpdateExpression='ADD #slot :delta',
+        ExpressionAttributeNames={'#slot': time_slot},
+        ExpressionAttributeValues={':delta': delta}
+    )
 
-def delete_submission(submission_id):
+def retry_publish_step(step, *args):
     """
-    Delete a submission from DynamoDB
+    Run a derived-view update with jittered retries. Returns the last
+    exception, or None once it succeeds.
     """
-    try:
-        table.delete_item(Key={'id': submission_id})
-        return True
-    except Exception as e:
-        return False
+    error = None
+    for attempt in range(PUBLISH_ATTEMPTS):
+        try:
+            step(*args)
+            return None
+        except Exception as e:
+            error = e
+            if attempt + 1 < PUBLISH_ATTEMPTS:
+                time.sleep(random.uniform(0, BOOKING_RETRY_DELAY * (2 ** attempt)))
+    return error
 
-def lambda_handler(event, context):
+def publish_write(time_slot=None, delta=0):
     """
-    AWS Lambda function to handle form submissions, admin data, and store data in DynamoDB
-    Enhanced with security measures and Cognito authentication
+    Update the derived views after a committed booking or delete: the
+    availability counts and the data version (bumped last, so a poller
+    never caches old data under the new version). The write already
+    happened, so failures don't fail it; they are counted (publish-stats)
+    and repaired by later requests.
     """
+    if time_slot in SLOT_INDEX and delta:
+        error = retry_publish_step(adjust_availability, time_slot, delta)
+        if error:
+            _publish_stats['availabilityFailures'] += 1
+            _publish_stats['lastError'] = str(error)
+            _publish_state['stale_availability'].add(CALENDAR.slot_event[time_slot])
     
-    # Get origin for CORS (handle different header casings and cases)
-    headers_in = event.get('headers', {}) or {}
-    origin = (headers_in.get('origin') or 
-              headers_in.get('Origin') or 
-              headers_in.get('ORIGIN') or 
-              headers_in.get('referer') or 
-              headers_in.get('Referer') or 
-              headers_in.get('REFERER') or '')
-    
-    # Extract origin from referer if needed
-    if origin.startswith('http'):
-        from urllib.parse import urlparse
-        parsed = urlparse(origin)
-        origin = f"{parsed.scheme}://{parsed.netloc}"
+    error = retry_publish_step(bump_data_version)
+    if error:
+        _publish_stats['versionFailures'] += 1
+        _publish_stats['lastError'] = str(error)
+        _publish_state['pending_bump'] = True
+
+def get_publish_stats():
+    """
+    Get derived-view update failures and repairs, and what is still pending
+    """
+    return dict(_publish_stats,
+                pendingBump=_publish_state['pending_bump'],
+                staleAvailability=sorted(_publish_state['stale_availability']))
+
+def bump_data_version():
+    """
+    Bump the data version
+    """
+    table.update_item(
+        Key={'id': DATA_VERSION_KEY},
+        UpdateExpression='ADD #version :one',
+        ExpressionAttributeNames={'#version': 'version'},
+        ExpressionAttributeValues={':one': 1}
+    )
+
+def get_data_version():
+    """
+    Read the current data version (0 before the first write). A bump that
+    failed earlier is retried first; if it fails again this raises, so
+    callers answer with an error rather than a 304 for changed data.
+    """
+    if _publish_state['pending_bump']:
+        bump_data_version()
+        _publish_state['pending_bump'] = False
+        _publish_stats['repairs'] += 1
     
-    cors_headers = get_cors_headers(origin)
+    response = table.get_item(Key={'id': DATA_VERSION_KEY}, ConsistentRead=True)
+    return int(response.get('Item', {}).get('version', 0))
+
+def get_availability(event_id=DEFAULT_EVENT_ID):
+    """
+    Read an event's per-slot booked counts from its availability item with
+    a single GetItem. Returns the remaining capacity of every slot, the
+    fully booked slot keys in calendar order and the bitmap of full slots
+    as hex (bit i set = the event's i-th slot is full).
+    """
+    event_slots = CALENDAR.event_slots.get(event_id, ())
+    response = table.get_item(Key={'id': get_event_key(event_id, AVAILABILITY_KEY)})
+    booked = response.get('Item', {})
     
-    # Handle preflight OPTIONS request
-    if event['httpMethod'] == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': cors_headers,
-            'body': json.dumps({'message': 'CORS preflight successful'})
-        }
+    now = time.time()
+    checked_at = _publish_state['checked_at'].setdefault(event_id, now)
+    recheck_due = AVAILABILITY_RECHECK_INTERVAL > 0 and now - checked_at >= AVAILABILITY_RECHECK_INTERVAL
+    if event_id in _publish_state['stale_availability'] or recheck_due:
+        booked = repair_availability(event_id, booked)
+    
+    remaining = {}
+    full_slots = []
+    bitmap = 0
+    for index, slot in enumerate(event_slots):
+        remaining[slot] = max(SLOT_CAPACITY[slot] - int(booked.get(slot, 0)), 0)
+        if not remaining[slot]:
+            full_slots.append(slot)
+            bitmap |= 1 << index
     
-    # Handle availability check requests (public endpoint - no auth required)
-    if event['httpMethod'] == 'GET' and '/availability' in event.get('path', ''):
+    return remaining, full_slots, f"{bitmap:0{(len(event_slots) + 3) // 4}x}"
+
+def read_slot_counters(event_id):
+    """
+    Read the booked counters of an event's slots with BatchGetItem.
+    Returns {time_slot: booked} for slots with a counter item.
+    """
+    keys = [{'id': get_slot_key(slot)} for slot in CALENDAR.event_slots.get(event_id, ())]
+    booked = {}
+    for start in range(0, len(keys), 100):  # BatchGetItem takes at most 100 keys
+        request = {table_name: {'Keys': keys[start:start + 100], 'ConsistentRead': True}}
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(table_name, []):
+                booked[item['timeSlot']] = int(item.get('booked', 0))
+            request = response.get('UnprocessedKeys')
+    return booked
+
+def repair_availability(event_id, stored):
+    """
+    Check an event's availability item against its slot counters and rewrite
+    it if an availability update was lost. Returns the counters, or the
+    stored item if they can't be read.
+    """
+    try:
+        booked = read_slot_counters(event_id)
+    except Exception as e:
+        _publish_stats['lastError'] = f"read slot counters for {event_id}: {e}"
+        return stored
+    
+    stored_counts = {slot: int(stored.get(slot, 0)) for slot in CALENDAR.event_slots.get(event_id, ())}
+    counter_counts = {slot: booked.get(slot, 0) for slot in stored_counts}
+    try:
+        if stored_counts != counter_counts:
+            table.put_item(Item=dict(booked, id=get_event_key(event_id, AVAILABILITY_KEY)))
+            _publish_stats['repairs'] += 1
+        _publish_state['stale_availability'].discard(event_id)
+        _publish_state['checked_at'][event_id] = time.time()
+    except Exception as e:
+        _publish_stats['lastError'] = f"repair availability for {event_id}: {e}"
+    return booked
+
+def rebuild_availability():
+    """
+    Recount bookings per slot from the submissions in the table and rewrite
+    the slot counters and the availability item, for repair after manual
+    edits or missed updates (and once when moving from single-booking
+    reservation items to counters). Bookings made while this runs may be
+    miscounted, so run it when traffic is quiet.
+    """
+    booked = {}
+    for item in parallel_scan(projection='id, timeSlot', filter_expression='attribute_exists(timeSlot)'):
+        if is_internal_key(item.get('id', '')):
+            continue
+        time_slot = item.get('timeSlot')
+        if time_slot in SLOT_INDEX:
+            booked[time_slot] = booked.get(time_slot, 0) + 1
+    
+    with table.batch_writer() as batch:
+        for slot in AVAILABILITY_SLOTS:
+            batch.put_item(Item={'id': get_slot_key(slot), 'timeSlot': slot, 'booked': booked.get(slot, 0)})
+        for event_id, event_slots in CALENDAR.event_slots.items():
+            availability = {slot: booked[slot] for slot in event_slots if slot in booked}
+            batch.put_item(Item=dict(availability, id=get_event_key(event_id, AVAILABILITY_KEY)))
+    _publish_state['stale_availability'].clear()
+    bump_data_version()
+    return {
+        'bookedCount': sum(booked.values()),
+        'fullSlots': sum(1 for slot, count in booked.items() if count >= SLOT_CAPACITY[slot])
+    }
+
+def save_submission(item):
+    """
+    Store a submission and take its place in the time slot in one
+    TransactWriteItems call: no scans, and the slot counter's capacity
+    condition means concurrent bookers can never overbook a slot.
+    Returns (status_code, message): 200 when stored, 409 when the time slot
+    is full, 429 when DynamoDB still asks us to back off after retries.
+    """
+    transact_items = build_submission_transaction(item)
+    for attempt in range(BOOKING_ATTEMPTS):
         try:
-            submissions = get_admin_data()
-            # Extract only time slots for public availability check
-            booked_slots = [submission.get('timeSlot') for submission in submissions if submission.get('timeSlot')]
-            return {
-                'statusCode': 200,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'bookedSlots': booked_slots,
-                    'count': len(booked_slots)
-                })
-            }
-        except Exception as e:
-            return {
-                'statusCode': 500,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'error': 'Failed to retrieve availability data',
-                    'message': str(e)
-                })
+            dynamodb.meta.client.transact_write_items(TransactItems=transact_items)
+            break
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code')
+            if error_code == 'TransactionCanceledException':
+                reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                if 'ConditionalCheckFailed' in reasons:
+                    return 409, f"Time slot {item.get('timeSlot')} is fully booked. Please choose a different time."
+                if any(code in RETRYABLE_CANCELLATION_CODES for code in reasons):
+                    if attempt + 1 < BOOKING_ATTEMPTS:
+                        time.sleep(random.uniform(0, BOOKING_RETRY_DELAY * (2 ** attempt)))
+                        continue
+                    return 429, "Too many bookings at once. Please try again."
+            elif error_code in ('ThrottlingException', 'ProvisionedThroughputExceededException',
+                                'TransactionInProgressException'):
+                return 429, "Too many bookings at once. Please try again."
+            raise
+    
+    publish_write(item.get('timeSlot'), 1)
+    return 200, ""
+
+def get_client_ip(event):
+    """
+    Extract client IP address from event
+    """
+    try:
+        return event.get('requestContext', {}).get('identity', {}).get('sourceIp', 'unknown')
+    except:
+        return 'unknown'
+
+# Per-container token buckets: ip -> [tokens, last refill time, drained window or None],
+# least recently used first
+_local_rate_buckets = OrderedDict()
+
+def check_local_rate_limit(ip_address):
+    """
+    In-process token bucket that rejects obvious floods before they reach
+    DynamoDB. It is deliberately looser than the shared counter, which
+    stays authoritative.
+    """
+    if ip_address == 'unknown':
+        return True, ""
+    
+    now = time.monotonic()
+    bucket = _local_rate_buckets.get(ip_address)
+    if bucket is None:
+        bucket = [float(LOCAL_RATE_LIMIT_BURST), now, None]
+        _local_rate_buckets[ip_address] = bucket
+        if len(_local_rate_buckets) > LOCAL_RATE_LIMIT_MAX_IPS:
+            _local_rate_buckets.popitem(last=False)
+    else:
+        _local_rate_buckets.move_to_end(ip_address)
+        if bucket[2] is not None and bucket[2] != get_rate_limit_window():
+            # The shared window that drained the bucket has ended: start over full
+            bucket[0], bucket[2] = float(LOCAL_RATE_LIMIT_BURST), None
+        else:
+            bucket[0] = min(LOCAL_RATE_LIMIT_BURST, bucket[0] + (now - bucket[1]) * LOCAL_RATE_LIMIT_REFILL_RATE)
+        bucket[1] = now
+    
+    if bucket[0] < 1:
+        return False, "Rate limit exceeded. Please try again later."
+    
+    bucket[0] -= 1
+    return True, ""
+
+def drain_local_rate_limit(ip_address):
+    """
+    Empty an IP's local bucket once the shared counter says it is over the
+    limit, so its next requests are rejected without a DynamoDB call. The
+    drain only lasts until that shared window ends.
+    """
+    bucket = _local_rate_buckets.get(ip_address)
+    if bucket is not None:
+        bucket[0] = 0.0
+        bucket[1] = time.monotonic()
+        bucket[2] = get_rate_limit_window()
+
+def get_rate_limit_window():
+    """
+    Get the number of the current shared rate limit window
+    """
+    return int(time.time() // RATE_LIMIT_WINDOW)
+
+def check_rate_limit(ip_address):
+    """
+    Simple rate limiting using DynamoDB. A single conditional UpdateItem
+    checks the window count and increments it atomically, so concurrent
+    requests from the same IP can't race past the limit.
+    """
+    try:
+        # Create a simple rate limit key
+        rate_key = f"rate_limit_{ip_address}_{get_rate_limit_window()}"
+        
+        # Increment the counter unless this IP has already hit the limit
+        rate_limit_table.update_item(
+            Key={'id': rate_key},
+            UpdateExpression='ADD #count :inc SET #ttl = if_not_exists(#ttl, :ttl)',
+            ConditionExpression='attribute_not_exists(#count) OR #count < :max',
+            ExpressionAttributeNames={'#count': 'count', '#ttl': 'ttl'},
+            ExpressionAttributeValues={
+                ':inc': 1,
+                ':max': MAX_REQUESTS_PER_WINDOW,
+                ':ttl': int(time.time()) + (RATE_LIMIT_WINDOW * 2)  # Auto-delete after 2 windows
             }
+        )
+        
+        return True, ""
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return False, "Rate limit exceeded. Please try again later."
+        # Allow request if rate limiting fails
+        return True, ""
+    except Exception as e:
+        # Allow request if rate limiting fails
+        return True, ""
+
+def purge_rate_limit_items():
+    """
+    Delete rate limit counters left in the submissions table from before
+    RATE_LIMIT_TABLE existed
+    """
+    if rate_limit_table_name == table_name:
+        return {'deleted': 0, 'message': 'RATE_LIMIT_TABLE is not configured; counters still live in this table'}
     
-    # Validate admin access for protected endpoints
-    admin_access_valid, admin_error = validate_admin_access(event)
-    if not admin_access_valid:
-        return {
-            'statusCode': 401,
-            'headers': cors_headers,
-            'body': json.dumps({
-                'error': 'Unauthorized',
-                'message': admin_error
-            })
+    deleted = 0
+    with table.batch_writer() as batch:
+        for item in parallel_scan(projection='id', filter_expression='begins_with(id, :prefix)',
+                                  expression_attribute_values={':prefix': 'rate_limit_'}):
+            batch.delete_item(Key={'id': item['id']})
+            deleted += 1
+    
+    return {'deleted': deleted}
+
+def get_submission_counters(item):
+    """
+    Get the aggregate counters one submission contributes to; empty for
+    anything that isn't a submission
+    """
+    if not is_submission(item):
+        return {}
+    
+    time_slot = item.get('timeSlot')
+    counters = {
+        'total': 1,
+        f"type#{'meeting' if time_slot else 'connection'}": 1
+    }
+    if item.get('createdAt'):
+        counters[f"day#{item['createdAt'][:10]}"] = 1
+    if item.get('communication'):
+        counters[f"channel#{item['communication']}"] = 1
+    if time_slot:
+        counters[f"meetingDay#{time_slot[:10]}"] = 1
+    return counters
+
+def diff_submission_counters(old_item, new_item):
+    """
+    Get the counter changes, per event, for a submission going from
+    old_item to new_item (either may be None)
+    """
+    changes = {}
+    for item, sign in ((new_item, 1), (old_item, -1)):
+        if not is_submission(item):
+            continue
+        deltas = changes.setdefault(get_submission_event_id(item), {})
+        for key, value in get_submission_counters(item).items():
+            deltas[key] = deltas.get(key, 0) + sign * value
+    
+    changes = {event_id: {key: value for key, value in deltas.items() if value}
+               for event_id, deltas in changes.items()}
+    return {event_id: deltas for event_id, deltas in changes.items() if deltas}
+
+def build_aggregates_update(deltas, event_id=DEFAULT_EVENT_ID):
+    """
+    Build the transaction operation that adds counter deltas to an event's
+    aggregates item
+    """
+    names = {}
+    values = {}
+    clauses = []
+    for position, (key, value) in enumerate(sorted(deltas.items())):
+        names[f'#c{position}'] = key
+        values[f':c{position}'] = value
+        clauses.append(f'#c{position} :c{position}')
+    
+    return {
+        'Update': {
+            'TableName': table_name,
+            'Key': serialize_item({'id': get_event_key(event_id, AGGREGATES_KEY)}),
+            'UpdateExpression': 'ADD ' + ', '.join(clauses),
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': serialize_item(values)
         }
+    }
+
+def apply_stream_record(record):
+    """
+    Apply one DynamoDB stream record to the aggregates items exactly once.
+    A marker item keyed by the record's eventID is written in the same
+    transaction, so a redelivered record fails its condition and is skipped.
+    Returns True when counters changed.
+    """
+    images = record.get('dynamodb', {})
+    old_item = deserialize_item(images['OldImage']) if 'OldImage' in images else None
+    new_item = deserialize_item(images['NewImage']) if 'NewImage' in images else None
     
-    # Handle PIN authentication requests
-    if event['httpMethod'] == 'POST' and '/pin-auth' in event.get('path', ''):
-        try:
-            if isinstance(event['body'], str):
-                body = json.loads(event['body'])
-            else:
-                body = event['body']
-            
-            pin = body.get('pin')
-            
-            if not pin:
-                return {
-                    'statusCode': 400,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'success': False,
-                        'message': 'PIN is required'
-                    })
-                }
-            
-            # Authenticate PIN
-            is_valid, result = authenticate_pin(pin)
-            
-            if is_valid:
-                return {
-                    'statusCode': 200,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'success': True,
-                        'sessionToken': result,
-                        'message': 'PIN authentication successful'
-                    })
-                }
-            else:
-                return {
-                    'statusCode': 401,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'success': False,
-                        'message': result
-                    })
+    changes = diff_submission_counters(old_item, new_item)
+    if not changes:
+        return False
+    
+    marker = {
+        'id': f"{STREAM_EVENT_PREFIX}{record['eventID']}",
+        'ttl': int(time.time()) + STREAM_EVENT_TTL
+    }
+    try:
+        dynamodb.meta.client.transact_write_items(TransactItems=[
+            {
+                'Put': {
+                    'TableName': table_name,
+                    'Item': serialize_item(marker),
+                    'ConditionExpression': 'attribute_not_exists(id)'
                 }
-                
-        except Exception as e:
-            return {
-                'statusCode': 500,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'success': False,
-                    'message': 'Authentication failed'
-                })
             }
+        ] + [build_aggregates_update(deltas, event_id) for event_id, deltas in sorted(changes.items())])
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'TransactionCanceledException':
+            reasons = e.response.get('CancellationReasons', [])
+            if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                return False
+        raise
+
+def format_aggregates(item):
+    """
+    Convert the flat aggregates item into grouped dashboard counters
+    """
+    stats = {'total': int(item.get('total', 0))}
+    stats.update({group: {} for group in AGGREGATE_GROUPS.values()})
+    for key, value in item.items():
+        prefix, _, name = key.partition('#')
+        if name and prefix in AGGREGATE_GROUPS and int(value):
+            stats[AGGREGATE_GROUPS[prefix]][name] = int(value)
+    return stats
+
+def get_admin_stats(event_id=DEFAULT_EVENT_ID):
+    """
+    Read an event's dashboard counters with a single GetItem
+    """
+    response = table.get_item(Key={'id': get_event_key(event_id, AGGREGATES_KEY)})
+    return format_aggregates(response.get('Item', {}))
+
+def rebuild_aggregates():
+    """
+    Recompute every event's aggregates item from the submissions in the
+    table, to seed them when the stream is first enabled or repair them
+    afterwards. Stream records processed while this runs may be counted twice.
+    """
+    counters = {event_id: {} for event_id in EVENT_IDS}
+    for item in parallel_scan(projection='listKey, eventId, timeSlot, createdAt, communication',
+                              filter_expression='attribute_exists(listKey)'):
+        if not is_submission(item):
+            continue
+        event_counters = counters.setdefault(get_submission_event_id(item), {})
+        for key, value in get_submission_counters(item).items():
+            event_counters[key] = event_counters.get(key, 0) + value
     
-    # Handle admin data requests
-    if event['httpMethod'] == 'GET' and '/admin-data' in event.get('path', ''):
-        try:
-            submissions = get_admin_data()
-            return {
-                'statusCode': 200,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'submissions': submissions,
-                    'count': len(submissions)
-                })
-            }
-        except Exception as e:
-            return {
-                'statusCode': 500,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'error': 'Failed to retrieve admin data',
-                    'message': str(e)
-                })
+    with table.batch_writer() as batch:
+        for event_id, event_counters in counters.items():
+            batch.put_item(Item=dict(event_counters, id=get_event_key(event_id, AGGREGATES_KEY)))
+    return {event_id: event_counters.get('total', 0) for event_id, event_counters in counters.items()}
+
+def build_cors_headers(origin):
+    """
+    Build the (read-only) CORS header set for an allowed origin
+    """
+    return MappingProxyType({
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': origin,
+        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,If-None-Match',
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+        'Access-Control-Expose-Headers': 'ETag,Content-Disposition',
+        'Access-Control-Max-Age': '86400'
+    })
+
+# Header sets per allowed origin, built once per container
+CORS_HEADERS = {origin: build_cors_headers(origin) for origin in ALLOWED_ORIGINS | {DEFAULT_ORIGIN}}
+
+# Preflight responses per allowed origin with the body serialized up front. They are
+# shared between invocations, so nothing may modify them.
+PREFLIGHT_BODY = json.dumps({'message': 'CORS preflight successful'})
+PREFLIGHT_RESPONSES = {
+    origin: {'statusCode': 200, 'headers': dict(headers), 'body': PREFLIGHT_BODY}
+    for origin, headers in CORS_HEADERS.items()
+}
+
+def get_cors_headers(origin):
+    """
+    Get CORS headers based on origin; origins that aren't allowed get the
+    main domain's headers (without exposing the allowed origins)
+    """
+    return CORS_HEADERS.get(origin) or CORS_HEADERS[DEFAULT_ORIGIN]
+
+def get_preflight_response(origin):
+    """
+    Get the constant OPTIONS response for an origin
+    """
+    return PREFLIGHT_RESPONSES.get(origin) or PREFLIGHT_RESPONSES[DEFAULT_ORIGIN]
+
+def get_request_origin(headers):
+    """
+    Get the request origin from a lower-cased header view, falling back to
+    the scheme and host of the Referer
+    """
+    origin = headers.get('origin') or headers.get('referer') or ''
+    if origin in ALLOWED_ORIGINS:
+        return origin
+    
+    # Extract origin from referer if needed
+    if origin.startswith('http'):
+        parsed = urlparse(origin)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+    return origin
+
+def format_submission(item):
+    """
+    Convert a stored submission into the admin dashboard format
+    """
+    # Determine type based on whether it has a meeting time
+    time_slot = item.get('timeSlot')
+    submission_type = 'meeting' if time_slot else 'connection'
+    
+    return {
+        'id': item['id'],
+        'name': item['name'],
+        'communication': item['communication'],
+        'info': item.get('info', ''),
+        'comments': item.get('comments', ''),
+        'timeSlot': time_slot,
+        'timestamp': item['createdAt'],
+        'type': submission_type
+    }
+
+def encode_cursor(last_evaluated_key):
+    """
+    Turn a LastEvaluatedKey into an opaque, signed pagination cursor
+    """
+    payload = base64.urlsafe_b64encode(json.dumps(last_evaluated_key, sort_keys=True).encode('utf-8')).decode('ascii')
+    signature = hmac.new(CURSOR_SECRET.encode('utf-8'), payload.encode('ascii'), hashlib.sha256).hexdigest()[:32]
+    return f"{payload}.{signature}"
+
+def decode_cursor(cursor):
+    """
+    Verify a pagination cursor and return the ExclusiveStartKey it encodes.
+    Raises ValueError for tampered or malformed cursors.
+    """
+    payload, _, signature = cursor.partition('.')
+    expected = hmac.new(CURSOR_SECRET.encode('utf-8'), payload.encode('ascii'), hashlib.sha256).hexdigest()[:32]
+    if not signature or not hmac.compare_digest(signature.encode('utf-8'), expected.encode('ascii')):
+        raise ValueError("Invalid cursor")
+    
+    start_key = json.loads(base64.urlsafe_b64decode(payload.encode('ascii')))
+    if not isinstance(start_key, dict):
+        raise ValueError("Invalid cursor")
+    return start_key
+
+def query_submissions(list_key, limit=None, start_key=None, since=None):
+    """
+    Query one page of an index partition (an event's submissions or
+    tombstones), newest first, optionally only items created after `since`.
+    Returns (items, last_evaluated_key).
+    """
+    query_kwargs = {
+        'IndexName': SUBMISSIONS_INDEX,
+        'KeyConditionExpression': '#listKey = :list_key',
+        'ExpressionAttributeNames': {'#listKey': 'listKey'},
+        'ExpressionAttributeValues': {':list_key': list_key},
+        'ScanIndexForward': False
+    }
+    if since:
+        query_kwargs['KeyConditionExpression'] += ' AND #createdAt > :since'
+        query_kwargs['ExpressionAttributeNames']['#createdAt'] = 'createdAt'
+        query_kwargs['ExpressionAttributeValues'][':since'] = since
+    if limit:
+        query_kwargs['Limit'] = limit
+    if start_key:
+        query_kwargs['ExclusiveStartKey'] = start_key
+    
+    response = table.query(**query_kwargs)
+    return response.get('Items', []), response.get('LastEvaluatedKey')
+
+def get_admin_data_page(limit=ADMIN_PAGE_SIZE, cursor=None, event_id=DEFAULT_EVENT_ID):
+    """
+    Retrieve one page of an event's submissions for the admin dashboard.
+    Returns (submissions, next_cursor); next_cursor is None on the last page.
+    """
+    list_key = get_event_key(event_id, SUBMISSION_LIST_KEY)
+    start_key = decode_cursor(cursor) if cursor else None
+    if start_key and start_key.get('listKey') != list_key:
+        raise ValueError("Cursor belongs to a different event")
+    
+    items, last_evaluated_key = query_submissions(list_key, limit, start_key)
+    next_cursor = encode_cursor(last_evaluated_key) if last_evaluated_key else None
+    return [format_submission(item) for item in items], next_cursor
+
+def iter_index_items(list_key, since=None):
+    """
+    Yield raw items for a listKey from the createdAt index, newest first,
+    one page at a time
+    """
+    start_key = None
+    while True:
+        items, start_key = query_submissions(list_key, start_key=start_key, since=since)
+        yield from items
+        if not start_key:
+            break
+
+def iter_submissions(event_id=DEFAULT_EVENT_ID):
+    """
+    Yield every submission of an event in admin dashboard format, newest
+    first, one index page at a time
+    """
+    for item in iter_index_items(get_event_key(event_id, SUBMISSION_LIST_KEY)):
+        yield format_submission(item)
+
+def get_admin_data_since(since, event_id=DEFAULT_EVENT_ID):
+    """
+    Retrieve submissions created and deleted after a watermark. Reads start
+    DELTA_SYNC_OVERLAP seconds early, so callers must merge by id.
+    Returns (submissions, deleted_ids, watermark), or None when the
+    watermark predates tombstone retention and a full reload is needed.
+    Raises ValueError for a malformed watermark.
+    """
+    since_time = datetime.fromisoformat(since)
+    if since_time.tzinfo is not None:
+        raise ValueError('Watermark must be a naive createdAt timestamp')
+    if since_time < datetime.utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+        return None
+    
+    query_since = (since_time - timedelta(seconds=DELTA_SYNC_OVERLAP)).isoformat()
+    watermark = since
+    
+    submissions = []
+    for item in iter_index_items(get_event_key(event_id, SUBMISSION_LIST_KEY), since=query_since):
+        submissions.append(format_submission(item))
+        watermark = max(watermark, item['createdAt'])
+    
+    deleted_ids = []
+    for item in iter_index_items(get_event_key(event_id, TOMBSTONE_LIST_KEY), since=query_since):
+        deleted_ids.append(item['submissionId'])
+        watermark = max(watermark, item['createdAt'])
+    
+    return submissions, deleted_ids, watermark
+
+def get_admin_data(event_id=DEFAULT_EVENT_ID):
+    """
+    Retrieve all of an event's form submissions for admin dashboard (newest
+    first). Read errors propagate, so callers never mistake a failed read
+    for an empty table.
+    """
+    return list(iter_submissions(event_id))
+
+def backfill_list_keys():
+    """
+    Assign submissions stored before events (or before the createdAt index)
+    existed to the default event, so they show up in its admin dashboard
+    """
+    updated = 0
+    for item in parallel_scan(projection='id',
+                              filter_expression='attribute_not_exists(eventId) AND attribute_exists(createdAt)'):
+        if is_internal_key(item['id']):
+            continue
+        table.update_item(
+            Key={'id': item['id']},
+            UpdateExpression='SET listKey = :list_key, eventId = :event_id',
+            ExpressionAttributeValues={
+                ':list_key': get_event_key(DEFAULT_EVENT_ID, SUBMISSION_LIST_KEY),
+                ':event_id': DEFAULT_EVENT_ID
             }
+        )
+        updated += 1
     
-    # Handle delete requests
-    if event['httpMethod'] == 'DELETE' and '/delete-submission' in event.get('path', ''):
+    return {'updated': updated}
+
+def csv_safe(value):
+    """
+    Render a value for CSV, neutralizing spreadsheet formula prefixes
+    """
+    text = '' if value is None else str(value)
+    if text.startswith(('=', '+', '-', '@')):
+        return "'" + text
+    return text
+
+def encode_export_rows(submissions, export_format):
+    """
+    Encode submissions as CSV or NDJSON text, one row at a time
+    """
+    if export_format == 'ndjson':
+        for submission in submissions:
+            yield json.dumps(submission) + '\n'
+        return
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in EXPORT_CSV_COLUMNS])
+    yield buffer.getvalue()
+    for submission in submissions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([csv_safe(submission.get(field)) for _, field in EXPORT_CSV_COLUMNS])
+        yield buffer.getvalue()
+
+def build_export(export_format, submission_type=None, event_id=DEFAULT_EVENT_ID):
+    """
+    Page through the submissions and gzip the encoded rows incrementally.
+    The compressed output stays in memory up to EXPORT_INLINE_LIMIT and
+    rolls over to a temporary file beyond that.
+    Returns (file object positioned at 0, compressed size, row count).
+    """
+    submissions = iter_submissions(event_id)
+    if submission_type:
+        submissions = (submission for submission in submissions if submission['type'] == submission_type)
+    
+    rows = 0
+    output = tempfile.SpooledTemporaryFile(max_size=EXPORT_INLINE_LIMIT)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for chunk in encode_export_rows(submissions, export_format):
+        rows += 1
+        output.write(compressor.compress(chunk.encode('utf-8')))
+    output.write(compressor.flush())
+    
+    size = output.tell()
+    output.seek(0)
+    if export_format == 'csv':
+        rows -= 1  # Header line
+    return output, size, rows
+
+def spill_export(output, filename, content_type):
+    """
+    Store an export that is too large to return inline and get a download
+    URL for it: a presigned S3 URL, or a file:// URL when EXPORT_SPILL_DIR
+    stands in for the bucket. Returns None when neither is configured.
+    """
+    key = f"exports/{uuid.uuid4()}/{filename}.gz"
+    
+    if EXPORT_BUCKET:
+        s3 = boto3.client('s3')
+        s3.upload_fileobj(output, EXPORT_BUCKET, key, ExtraArgs={
+            'ContentType': content_type,
+            'ContentEncoding': 'gzip',
+            'ContentDisposition': f'attachment; filename="{filename}"'
+        })
+        return s3.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': EXPORT_BUCKET, 'Key': key},
+            ExpiresIn=EXPORT_URL_TTL
+        )
+    
+    if EXPORT_SPILL_DIR:
+        path = os.path.join(EXPORT_SPILL_DIR, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as spill_file:
+            shutil.copyfileobj(output, spill_file)
+        return 'file://' + os.path.abspath(path)
+    
+    return None
+
+def delete_submission(submission_id):
+    """
+    Delete a submission from DynamoDB, releasing its place in the time slot
+    """
+    try:
+        item = table.get_item(Key={'id': submission_id}, ConsistentRead=True).get('Item')
+        if not item:
+            return True
+        
+        time_slot = item.get('timeSlot')
+        event_id = get_submission_event_id(item)
         try:
-            # Safely parse body if present
-            body = None
-            if 'body' in event and event['body'] is not None:
-                if isinstance(event['body'], str) and event['body'] != '':
-                    try:
-                        body = json.loads(event['body'])
-                    except Exception:
-                        body = None
-                elif isinstance(event['body'], dict):
-                    body = event['body']
-
-            # Accept ID from JSON body or query string to be robust against proxies dropping DELETE bodies
-            submission_id = None
-            if isinstance(body, dict):
-                submission_id = body.get('id')
-            if not submission_id:
-                qs = event.get('queryStringParameters') or {}
-                submission_id = qs.get('id') if isinstance(qs, dict) else None
-
-            if not submission_id:
-                return {
-                    'statusCode': 400,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'error': 'Missing submission ID',
-                        'message': 'Submission ID is required'
-                    })
-                }
+            dynamodb.meta.client.transact_write_items(
+                TransactItems=build_deletion_transaction(submission_id, event_id, time_slot))
+        except ClientError as e:
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+            if not reasons:
+                raise
+            if reasons[0] == 'ConditionalCheckFailed':
+                return True  # Deleted concurrently
+            if not (time_slot and reasons[1] == 'ConditionalCheckFailed'):
+                raise
+            # The slot counter is already at zero (e.g. the booking predates counters)
+            dynamodb.meta.client.transact_write_items(TransactItems=build_deletion_transaction(submission_id, event_id))
+            time_slot = None
+        
+        publish_write(time_slot, -1)
+        return True
+    except Exception as e:
+        return False
 
-            success = delete_submission(submission_id)
-            if success:
-                return {
-                    'statusCode': 200,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'message': 'Submission deleted successfully',
-                        'id': submission_id
-                    })
-                }
-            else:
-                return {
-                    'statusCode': 500,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'error': 'Failed to delete submission',
-                        'message': 'Could not delete the submission'
-                    })
-                }
-        except Exception as e:
+def json_response(status_code, headers, payload):
+    """
+    Build an API Gateway proxy response with a JSON body
+    """
+    return {
+        'statusCode': status_code,
+        'headers': dict(headers),  # Header sets are shared read-only mappings
+        'body': json.dumps(payload)
+    }
+
+def get_etag(version):
+    """
+    Build the ETag for a data version. Weak, since the same version may be
+    served gzip-compressed or not.
+    """
+    return f'W/"v{version}"'
+
+def with_etag(headers, etag):
+    """
+    Copy response headers adding the ETag; no-cache makes browsers
+    revalidate with If-None-Match on every poll
+    """
+    return dict(headers, **{'ETag': etag, 'Cache-Control': 'no-cache'})
+
+def is_not_modified(event, etag):
+    """
+    Check If-None-Match against the current ETag (weak comparison)
+    """
+    if_none_match = get_header(event.get('headers'), 'If-None-Match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    current = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+def not_modified_response(headers, etag):
+    """
+    Build a bodyless 304 response
+    """
+    return {
+        'statusCode': 304,
+        'headers': with_etag(headers, etag),
+        'body': ''
+    }
+
+def get_header(headers, name):
+    """
+    Case-insensitive request header lookup
+    """
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is not None:
+        return value
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick a response encoding from an Accept-Encoding header.
+    Returns 'br', 'gzip' or None (identity).
+    """
+    if not accept_encoding:
+        return None
+    
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+    
+    wildcard = qualities.get('*', 0.0)
+    candidates = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def compress_response(response, accept_encoding, route_name):
+    """
+    Compress a text response body when the client accepts it and the body is
+    at least COMPRESSION_MIN_SIZE bytes. Returns a new response dict; the
+    input (and its headers) are left untouched.
+    """
+    body = response.get('body')
+    headers = response.get('headers') or {}
+    if not isinstance(body, str) or response.get('isBase64Encoded') or 'Content-Encoding' in headers:
+        return response
+    
+    raw = body.encode('utf-8')
+    if len(raw) < COMPRESSION_MIN_SIZE:
+        return response
+    
+    headers = dict(headers)
+    vary = headers.get('Vary')
+    headers['Vary'] = f"{vary}, Accept-Encoding" if vary else 'Accept-Encoding'
+    
+    stats = _compression_stats.setdefault(route_name, {
+        'responses': 0,
+        'compressed': 0,
+        'bytesIn': 0,
+        'bytesOut': 0
+    })
+    stats['responses'] += 1
+    
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding == 'br':
+        compressed = brotli.compress(raw, quality=BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        compressed = gzip.compress(raw, compresslevel=COMPRESSION_LEVEL)
+    else:
+        return dict(response, headers=headers)
+    
+    if len(compressed) >= len(raw):
+        return dict(response, headers=headers)
+    
+    stats['compressed'] += 1
+    stats['bytesIn'] += len(raw)
+    stats['bytesOut'] += len(compressed)
+    
+    headers['Content-Encoding'] = encoding
+    return dict(response, headers=headers,
+                body=base64.b64encode(compressed).decode('ascii'),
+                isBase64Encoded=True)
+
+def get_compression_stats():
+    """
+    Get per-route compression counters, including bytes saved
+    """
+    return {
+        route_name: dict(stats, bytesSaved=stats['bytesIn'] - stats['bytesOut'])
+        for route_name, stats in _compression_stats.items()
+    }
+
+class RequestTooLargeError(ValueError):
+    """
+    Raised by parse_request_body for bodies over MAX_REQUEST_SIZE
+    """
+
+def parse_request_body(event, strict=True):
+    """
+    Parse the JSON request body. In strict mode invalid JSON raises
+    json.JSONDecodeError; otherwise it yields None. Bodies longer than
+    MAX_REQUEST_SIZE (measured after base64 decoding) raise
+    RequestTooLargeError in either mode.
+    """
+    body = event.get('body')
+    if isinstance(body, dict):
+        return body
+    if isinstance(body, str) and event.get('isBase64Encoded'):
+        # API Gateway base64-encodes bodies whose type matches a binary media type
+        try:
+            body = base64.b64decode(body).decode('utf-8')
+        except ValueError:
+            if strict:
+                raise json.JSONDecodeError('Invalid base64 request body', '', 0)
+            return None
+    if not isinstance(body, str) or body == '':
+        if strict:
+            raise json.JSONDecodeError('Empty request body', '', 0)
+        return None
+    if len(body) > MAX_REQUEST_SIZE:
+        raise RequestTooLargeError('Request size exceeds maximum allowed')
+    
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError:
+        if strict:
+            raise
+        return None
+
+def handle_availability(event, body, cors_headers, event_id):
+    """
+    Public endpoint returning remaining capacity per time slot; bookedSlots
+    lists the slots with none left
+    """
+    try:
+        # Read the version before the data so a concurrent write can only make the ETag older
+        etag = get_etag(get_data_version())
+        if is_not_modified(event, etag):
+            return not_modified_response(cors_headers, etag)
+        
+        remaining, full_slots, bitmap = get_availability(event_id)
+        return json_response(200, with_etag(cors_headers, etag), {
+            'eventId': event_id,
+            'remaining': remaining,
+            'bookedSlots': full_slots,
+            'count': len(full_slots),
+            'bitmap': bitmap,
+            'calendar': [event for event in CALENDAR.events if event['id'] == event_id]
+        })
+    except Exception as e:
+        return json_response(500, cors_headers, {
+            'error': 'Failed to retrieve availability data',
+            'message': str(e)
+        })
+
+def handle_pin_auth(event, body, cors_headers, event_id):
+    """
+    Exchange the admin PIN for a session token
+    """
+    pin = body.get('pin') if isinstance(body, dict) else None
+    
+    if not pin:
+        return json_response(400, cors_headers, {
+            'success': False,
+            'message': 'PIN is required'
+        })
+    
+    # Authenticate PIN
+    is_valid, result = authenticate_pin(pin)
+    
+    if is_valid:
+        return json_response(200, cors_headers, {
+            'success': True,
+            'sessionToken': result,
+            'message': 'PIN authentication successful'
+        })
+    
+    return json_response(401, cors_headers, {
+        'success': False,
+        'message': result
+    })
+
+def handle_admin_data(event, body, cors_headers, event_id):
+    """
+    Return submissions for the admin dashboard: every submission, one
+    page when ?limit= and/or ?cursor= are given, or only the changes after
+    a previous response's watermark when ?since= is given
+    """
+    qs = event.get('queryStringParameters') or {}
+    try:
+        etag = get_etag(get_data_version())
+    except Exception as e:
+        return json_response(500, cors_headers, {
+            'error': 'Failed to retrieve admin data',
+            'message': str(e)
+        })
+    if is_not_modified(event, etag):
+        return not_modified_response(cors_headers, etag)
+    
+    if qs.get('since'):
+        try:
+            delta = get_admin_data_since(qs['since'], event_id)
+        except ValueError:
+            return json_response(400, cors_headers, {
+                'error': 'Invalid since parameter',
+                'message': 'since must be the watermark from a previous response'
+            })
+        if delta is not None:
+            submissions, deleted_ids, watermark = delta
+            return json_response(200, with_etag(cors_headers, etag), {
+                'submissions': submissions,
+                'count': len(submissions),
+                'deleted': deleted_ids,
+                'watermark': watermark
+            })
+    
+    if 'limit' in qs or 'cursor' in qs:
+        try:
+            limit = min(max(int(qs.get('limit') or ADMIN_PAGE_SIZE), 1), MAX_ADMIN_PAGE_SIZE)
+            submissions, next_cursor = get_admin_data_page(limit, qs.get('cursor'), event_id)
+        except ValueError:
+            return json_response(400, cors_headers, {
+                'error': 'Invalid pagination parameters',
+                'message': 'limit must be a number and cursor must come from a previous response'
+            })
+        return json_response(200, with_etag(cors_headers, etag), {
+            'submissions': submissions,
+            'count': len(submissions),
+            'nextCursor': next_cursor
+        })
+    
+    try:
+        # Taken before reading so nothing written during the read is skipped by the next ?since=
+        watermark = datetime.utcnow().isoformat()
+        submissions = get_admin_data(event_id)
+        return json_response(200, with_etag(cors_headers, etag), {
+            'submissions': submissions,
+            'count': len(submissions),
+            'watermark': watermark
+        })
+    except Exception as e:
+        return json_response(500, cors_headers, {
+            'error': 'Failed to retrieve admin data',
+            'message': str(e)
+        })
+
+def handle_admin_export(event, body, cors_headers, event_id):
+    """
+    Export submissions as gzipped CSV or NDJSON (?format=csv|ndjson,
+    optional ?type=meeting|connection). Large exports are returned as a
+    download URL instead of inline.
+    """
+    qs = event.get('queryStringParameters') or {}
+    export_format = (qs.get('format') or 'csv').lower()
+    submission_type = qs.get('type') or None
+    if export_format not in EXPORT_CONTENT_TYPES or submission_type not in (None, 'meeting', 'connection'):
+        return json_response(400, cors_headers, {
+            'error': 'Invalid export parameters',
+            'message': 'format must be csv or ndjson and type must be meeting or connection'
+        })
+    
+    try:
+        output, size, rows = build_export(export_format, submission_type, event_id)
+    except Exception as e:
+        return json_response(500, cors_headers, {
+            'error': 'Failed to export data',
+            'message': str(e)
+        })
+    
+    filename = f"tesconnections-{event_id}-{submission_type or 'all'}-data.{export_format}"
+    content_type = EXPORT_CONTENT_TYPES[export_format]
+    with output:
+        if size <= EXPORT_INLINE_LIMIT:
             return {
-                'statusCode': 500,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'error': 'Delete request failed',
-                    'message': str(e)
-                })
+                'statusCode': 200,
+                'headers': dict(cors_headers, **{
+                    'Content-Type': content_type,
+                    'Content-Encoding': 'gzip',
+                    'Content-Disposition': f'attachment; filename="{filename}"'
+                }),
+                'body': base64.b64encode(output.read()).decode('ascii'),
+                'isBase64Encoded': True
             }
+        
+        download_url = spill_export(output, filename, content_type)
+    
+    if not download_url:
+        return json_response(413, cors_headers, {
+            'error': 'Export too large',
+            'message': 'Export exceeds the inline size limit and no export bucket is configured'
+        })
     
+    return json_response(200, cors_headers, {
+        'downloadUrl': download_url,
+        'expiresIn': EXPORT_URL_TTL,
+        'rows': rows,
+        'compressedBytes': size
+    })
+
+def handle_admin_stats(event, body, cors_headers, event_id):
+    """
+    Return the live dashboard counters kept by the stream consumer
+    """
     try:
-        # Security: Validate API key for form submissions
-        api_key_valid, api_key_error = validate_api_key(event)
-        if not api_key_valid:
-            return {
-                'statusCode': 401,
-                'headers': cors_headers,
-                'body': json.dumps({
+        return json_response(200, cors_headers, get_admin_stats(event_id))
+    except Exception as e:
+        return json_response(500, cors_headers, {
+            'error': 'Failed to retrieve admin stats',
+            'message': str(e)
+        })
+
+def handle_delete_submission(event, body, cors_headers, event_id):
+    """
+    Delete a submission by ID
+    """
+    try:
+        # Accept ID from JSON body or query string to be robust against proxies dropping DELETE bodies
+        submission_id = None
+        if isinstance(body, dict):
+            submission_id = body.get('id')
+        if not submission_id:
+            qs = event.get('queryStringParameters') or {}
+            submission_id = qs.get('id') if isinstance(qs, dict) else None
+
+        if not submission_id:
+            return json_response(400, cors_headers, {
+                'error': 'Missing submission ID',
+                'message': 'Submission ID is required'
+            })
+
+        success = delete_submission(submission_id)
+        if success:
+            return json_response(200, cors_headers, {
+                'message': 'Submission deleted successfully',
+                'id': submission_id
+            })
+        
+        return json_response(500, cors_headers, {
+            'error': 'Failed to delete submission',
+            'message': 'Could not delete the submission'
+        })
+    except Exception as e:
+        return json_response(500, cors_headers, {
+            'error': 'Delete request failed',
+            'message': str(e)
+        })
+
+def handle_form_submission(event, body, cors_headers, event_id):
+    """
+    Validate and store a contact form or meeting booking submission
+    """
+    # Security: Validate required fields with sanitization
+    if not isinstance(body, dict):
+        raise json.JSONDecodeError('Expected a JSON object', '', 0)
+    
+    required_fields = ['name', 'communication']
+    for field in required_fields:
+        if field not in body or not body[field].strip():
+            return json_response(400, cors_headers, {
+                'error': f'Missing required field: {field}',
+                'message': 'Please fill in all required fields'
+            })
+    
+    # Security: Validate and sanitize name
+    name_valid, name_error = validate_name(body['name'])
+    if not name_valid:
+        return json_response(400, cors_headers, {
+            'error': 'Invalid name',
+            'message': name_error
+        })
+    
+    # Security: Validate communication method
+    comm_valid, comm_error = validate_communication(body['communication'])
+    if not comm_valid:
+        return json_response(400, cors_headers, {
+            'error': 'Invalid communication method',
+            'message': comm_error
+        })
+    
+    # Security: Validate time slot if provided
+    time_slot = body.get('timeSlot')
+    if time_slot:
+        time_slot_valid, time_slot_error = validate_time_slot(time_slot)
+        if not time_slot_valid:
+            return json_response(400, cors_headers, {
+                'error': 'Invalid time slot',
+                'message': time_slot_error
+            })
+        if CALENDAR.slot_event.get(time_slot) != event_id:
+            return json_response(400, cors_headers, {
+                'error': 'Invalid time slot',
+                'message': f'Time slot does not belong to event {event_id}'
+            })
+    
+    # Security: Sanitize all text inputs
+    sanitized_name = sanitize_input(body['name'], 100)
+    sanitized_info = sanitize_input(body.get('info', ''), 500)
+    sanitized_comments = sanitize_input(body.get('comments', ''), 1000)
+    
+    # Generate unique ID
+    submission_id = str(uuid.uuid4())
+    
+    # Security: Prepare sanitized data for DynamoDB
+    item = {
+        'id': submission_id,
+        'name': sanitized_name,
+        'communication': body['communication'],
+        'info': sanitized_info,
+        'comments': sanitized_comments,
+        'timeSlot': body.get('timeSlot'),  # Add timeSlot for meetings
+        'timestamp': body.get('timestamp', datetime.utcnow().isoformat()),
+        'userAgent': sanitize_input(body.get('userAgent', ''), 200),
+        'referrer': sanitize_input(body.get('referrer', ''), 200),
+        'ipAddress': get_client_ip(event),
+        'createdAt': datetime.utcnow().isoformat(),
+        'status': 'new',
+        'eventId': event_id,
+        'listKey': get_event_key(event_id, SUBMISSION_LIST_KEY),
+        'ttl': int(time.time()) + (365 * 24 * 60 * 60)  # Auto-delete after 1 year
+    }
+    
+    # Store in DynamoDB together with the slot booking
+    status_code, save_error = save_submission(item)
+    if status_code == 409:
+        return json_response(409, cors_headers, {  # Conflict status code
+            'error': 'Time slot unavailable',
+            'message': save_error
+        })
+    if status_code == 429:
+        return json_response(429, cors_headers, {
+            'error': 'Too many requests',
+            'message': save_error
+        })
+    
+    return json_response(200, cors_headers, {
+        'message': 'Form submitted successfully',
+        'submissionId': submission_id,
+        'timestamp': item['createdAt']
+    })
+
+def handle_warmup(event, body, cors_headers, event_id):
+    """
+    Keep-warm ping: reports the container's warmup state without touching
+    the table. Public, so step errors are left out.
+    """
+    return json_response(200, cors_headers, get_warmup_status(include_errors=False))
+
+# Route metadata:
+#   auth          - None (public), 'admin' (PIN/Cognito token) or 'api_key' (form key)
+#   rate_limited  - apply the per-IP submission rate limit
+#   parse_body    - None, 'strict' (invalid JSON is a 400) or 'lenient' (invalid JSON is ignored)
+Route = namedtuple('Route', ['handler', 'auth', 'rate_limited', 'parse_body'])
+
+# (method, normalized path) -> Route, built once per container
+ROUTES = {
+    ('GET', '/availability'): Route(handle_availability, auth=None, rate_limited=False, parse_body=None),
+    ('POST', '/pin-auth'): Route(handle_pin_auth, auth=None, rate_limited=False, parse_body='strict'),
+    ('GET', '/admin-data'): Route(handle_admin_data, auth='admin', rate_limited=False, parse_body=None),
+    ('GET', '/admin-export'): Route(handle_admin_export, auth='admin', rate_limited=False, parse_body=None),
+    ('GET', '/admin-stats'): Route(handle_admin_stats, auth='admin', rate_limited=False, parse_body=None),
+    ('DELETE', '/delete-submission'): Route(handle_delete_submission, auth='admin', rate_limited=False, parse_body='lenient'),
+    ('POST', '/submit-contact'): Route(handle_form_submission, auth='api_key', rate_limited=True, parse_body='strict'),
+    ('GET', '/warmup'): Route(handle_warmup, auth=None, rate_limited=False, parse_body=None),
+}
+
+# Maintenance tasks run by direct invocation, e.g.
+#   aws lambda invoke --function-name ... --payload '{"task": "rebuild-availability"}' out.json
+MAINTENANCE_TASKS = {
+    'rebuild-availability': rebuild_availability,
+    'backfill-list-keys': backfill_list_keys,
+    'purge-rate-limit-items': purge_rate_limit_items,
+    'compression-stats': get_compression_stats,
+    'rebuild-aggregates': rebuild_aggregates,
+    'import-report': get_import_report,
+    'dynamodb-stats': get_dynamodb_call_stats,
+    'publish-stats': get_publish_stats,
+    'token-cache-stats': get_token_cache_stats,
+}
+
+def normalize_path(path):
+    """
+    Reduce a request path to its last segment so stage or base-path
+    prefixes don't matter ('/prod/admin-data/' -> '/admin-data')
+    """
+    if not path:
+        return '/'
+    return '/' + path.rstrip('/').rpartition('/')[2]
+
+def get_route_key(event):
+    """
+    Get the (method, normalized path) key of an API Gateway event; computed
+    once per request and passed along
+    """
+    return event.get('httpMethod'), normalize_path(event.get('path'))
+
+def resolve_route(route_key):
+    """
+    Find the route for a route key with a single dict lookup
+    """
+    return ROUTES.get(route_key)
+
+# Container init state, reported by warmup pings
+_warmup_state = {'ran': False, 'steps': {}, 'invocations': 0}
+
+def warm_dynamodb():
+    """
+    Open the DynamoDB connection (credentials, endpoint, TLS) with a
+    single-attribute read of the data version item
+    """
+    table.get_item(Key={'id': DATA_VERSION_KEY}, ProjectionExpression='id')
+
+def warm_jwks():
+    """
+    Fetch and parse the Cognito JWKS so the first admin request finds the keys cached
+    """
+    if not refresh_cognito_public_keys():
+        raise RuntimeError('JWKS fetch failed')
+
+def run_warmup_step(name, step):
+    """
+    Run one warmup step, recording its outcome and duration
+    """
+    start = time.perf_counter()
+    try:
+        step()
+        result = {'ok': True}
+    except Exception as e:
+        result = {'ok': False, 'error': str(e)}
+    result['ms'] = round((time.perf_counter() - start) * 1000, 3)
+    _warmup_state['steps'][name] = result
+
+def initialize():
+    """
+    Init-phase warmup, run once per container when WARMUP_ON_INIT is on.
+    Regexes, the route table and the CORS header sets are already built at
+    import; this opens the DynamoDB connection and, when a Cognito user
+    pool is configured, loads its JWKS. Steps run in parallel and init
+    waits at most WARMUP_TIMEOUT for them; failures are recorded, never
+    raised, and the request path redoes the same work lazily.
+    """
+    steps = [('dynamodb', warm_dynamodb)]
+    if COGNITO_USER_POOL_ID:
+        steps.append(('jwks', warm_jwks))
+    
+    threads = [threading.Thread(target=run_warmup_step, args=step, daemon=True) for step in steps]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + WARMUP_TIMEOUT
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0))
+    _warmup_state['ran'] = True
+    return _warmup_state['steps']
+
+def get_warmup_status(include_errors=True):
+    """
+    Get the container's init and warmup state. Step errors can name the
+    account, role and table, so only direct invocations include them.
+    """
+    steps = _warmup_state['steps']
+    if not include_errors:
+        steps = {name: {'ok': step['ok'], 'ms': step['ms']} for name, step in steps.items()}
+    return {
+        'warm': True,
+        'coldStart': _warmup_state['invocations'] <= 1,
+        'invocations': _warmup_state['invocations'],
+        'initMs': _init_ms,
+        'warmupRan': _warmup_state['ran'],
+        'warmup': steps
+    }
+
+def is_warmup_event(event):
+    """
+    Check for a keep-warm ping invoked directly, {"warmup": true}, or by an
+    EventBridge schedule
+    """
+    return 'httpMethod' not in event and (event.get('warmup') is True or
+                                          event.get('detail-type') == 'Scheduled Event')
+
+def lambda_handler(event, context):
+    """
+    AWS Lambda function to handle form submissions, admin data, and store data in DynamoDB
+    Enhanced with security measures and Cognito authentication
+    """
+    
+    _warmup_state['invocations'] += 1
+    
+    # Keep-warm pings return before any other work
+    if is_warmup_event(event):
+        return get_warmup_status()
+    
+    # Direct (non-API Gateway) invocations can run maintenance tasks
+    if 'httpMethod' not in event and event.get('task') in MAINTENANCE_TASKS:
+        return {
+            'task': event['task'],
+            'result': MAINTENANCE_TASKS[event['task']]()
+        }
+    
+    # DynamoDB stream batches, when the stream is mapped to this function
+    if 'httpMethod' not in event and is_stream_event(event):
+        return stream_handler(event, context)
+    
+    # Get origin for CORS from a single case-insensitive view of the headers
+    headers_in = event.get('headers', {}) or {}
+    headers_lower = {key.lower(): value for key, value in headers_in.items()}
+    origin = get_request_origin(headers_lower)
+    
+    # Handle preflight OPTIONS request
+    if event.get('httpMethod') == 'OPTIONS':
+        return get_preflight_response(origin)
+    
+    cors_headers = get_cors_headers(origin)
+    
+    route_key = get_route_key(event)
+    route = resolve_route(route_key)
+    if route is None:
+        return json_response(404, cors_headers, {
+            'error': 'Not found',
+            'message': 'Unknown endpoint'
+        })
+    
+    try:
+        # Security: Authenticate according to the route
+        if route.auth == 'admin':
+            admin_access_valid, admin_error = validate_admin_access(event)
+            if not admin_access_valid:
+                return json_response(401, cors_headers, {
                     'error': 'Unauthorized',
-                    'message': api_key_error
+                    'message': admin_error
                 })
-            }
-        
-        # Security: Check request size
-        request_size = len(str(event.get('body', '')))
-        if request_size > MAX_REQUEST_SIZE:
-            return {
-                'statusCode': 413,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'error': 'Request too large',
-                    'message': 'Request size exceeds maximum allowed'
+        elif route.auth == 'api_key':
+            api_key_valid, api_key_error = validate_api_key(event)
+            if not api_key_valid:
+                return json_response(401, cors_headers, {
+                    'error': 'Unauthorized',
+                    'message': api_key_error
                 })
-            }
-        
-        # Get client IP for rate limiting
-        client_ip = get_client_ip(event)
         
         # Security: Rate limiting
-        rate_ok, rate_message = check_rate_limit(client_ip)
-        if not rate_ok:
-            return {
-                'statusCode': 429,
-                'headers': cors_headers,
-                'body': json.dumps({
+        if route.rate_limited:
+            client_ip = get_client_ip(event)
+            rate_ok, rate_message = check_local_rate_limit(client_ip)
+            if rate_ok:
+                rate_ok, rate_message = check_rate_limit(client_ip)
+                if not rate_ok:
+                    drain_local_rate_limit(client_ip)
+            if not rate_ok:
+                return json_response(429, cors_headers, {
                     'error': 'Rate limit exceeded',
                     'message': rate_message
                 })
-            }
-        
-        # Parse request body
-        if isinstance(event['body'], str):
-            body = json.loads(event['body'])
-        else:
-            body = event['body']
-        
-        # Security: Validate required fields with sanitization
-        required_fields = ['name', 'communication']
-        for field in required_fields:
-            if field not in body or not body[field].strip():
-                return {
-                    'statusCode': 400,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'error': f'Missing required field: {field}',
-                        'message': 'Please fill in all required fields'
-                    })
-                }
         
-        # Security: Validate and sanitize name
-        name_valid, name_error = validate_name(body['name'])
-        if not name_valid:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'error': 'Invalid name',
-                    'message': name_error
-                })
-            }
+        # Security: Request size is checked on the decoded body
+        body = None
+        if route.parse_body:
+            body = parse_request_body(event, strict=route.parse_body == 'strict')
         
-        # Security: Validate communication method
-        comm_valid, comm_error = validate_communication(body['communication'])
-        if not comm_valid:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({
-                    'error': 'Invalid communication method',
-                    'message': comm_error
-                })
-            }
-        
-        # Security: Validate time slot if provided
-        time_slot = body.get('timeSlot')
-        if time_slot:
-            time_slot_valid, time_slot_error = validate_time_slot(time_slot)
-            if not time_slot_valid:
-                return {
-                    'statusCode': 400,
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'error': 'Invalid time slot',
-                        'message': time_slot_error
-                    })
-                }
-            
-            # Check if time slot is already booked
-            slot_available, availability_error = check_time_slot_availability(time_slot)
-            if not slot_available:
-                return {
-                    'statusCode': 409,  # Conflict status code
-                    'headers': cors_headers,
-                    'body': json.dumps({
-                        'error': 'Time slot unavailable',
-                        'message': availability_error
-                    })
-                }
-        
-        # Security: Sanitize all text inputs
-        sanitized_name = sanitize_input(body['name'], 100)
-        sanitized_info = sanitize_input(body.get('info', ''), 500)
-        sanitized_comments = sanitize_input(body.get('comments', ''), 1000)
-        
-        # Generate unique ID
-        submission_id = str(uuid.uuid4())
-        
-        # Security: Prepare sanitized data for DynamoDB
-        item = {
-            'id': submission_id,
-            'name': sanitized_name,
-            'communication': body['communication'],
-            'info': sanitized_info,
-            'comments': sanitized_comments,
-            'timeSlot': body.get('timeSlot'),  # Add timeSlot for meetings
-            'timestamp': body.get('timestamp', datetime.utcnow().isoformat()),
-            'userAgent': sanitize_input(body.get('userAgent', ''), 200),
-            'referrer': sanitize_input(body.get('referrer', ''), 200),
-            'ipAddress': client_ip,
-            'createdAt': datetime.utcnow().isoformat(),
-            'status': 'new',
-            'ttl': int(time.time()) + (365 * 24 * 60 * 60)  # Auto-delete after 1 year
-        }
-        
-        # Store in DynamoDB
-        table.put_item(Item=item)
-        
-        
-        return {
-            'statusCode': 200,
-            'headers': cors_headers,
-            'body': json.dumps({
-                'message': 'Form submitted successfully',
-                'submissionId': submission_id,
-                'timestamp': item['createdAt']
+        # Every route is scoped to one event (/events/<id>/..., ?eventId= or body eventId)
+        event_id = get_request_event_id(event, body)
+        if event_id not in EVENT_IDS:
+            return json_response(404, cors_headers, {
+                'error': 'Not found',
+                'message': 'Unknown event'
             })
-        }
         
+        response = route.handler(event, body, cors_headers, event_id)
+        return compress_response(
+            response,
+            headers_lower.get('accept-encoding'),
+            f"{route_key[0]} {route_key[1]}"
+        )
+        
+    except RequestTooLargeError:
+        return json_response(413, cors_headers, {
+            'error': 'Request too large',
+            'message': 'Request size exceeds maximum allowed'
+        })
     except json.JSONDecodeError:
-        return {
-            'statusCode': 400,
-            'headers': cors_headers,
-            'body': json.dumps({
-                'error': 'Invalid JSON',
-                'message': 'Please check your form data'
-            })
-        }
+        return json_response(400, cors_headers, {
+            'error': 'Invalid JSON',
+            'message': 'Please check your form data'
+        })
     
     except ClientError as e:
-        return {
-            'statusCode': 500,
-            'headers': cors_headers,
-            'body': json.dumps({
-                'error': 'Database error',
-                'message': 'Unable to save your information. Please try again.'
-            })
-        }
+        return json_response(500, cors_headers, {
+            'error': 'Database error',
+            'message': 'Unable to save your information. Please try again.'
+        })
     
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': cors_headers,
-            'body': json.dumps({
-                'error': 'Internal server error',
-                'message': 'Something went wrong. Please try again later.'
-            })
-        }
+        return json_response(500, cors_headers, {
+            'error': 'Internal server error',
+            'message': 'Something went wrong. Please try again later.'
+        })
+
+def is_stream_event(event):
+    """
+    Check whether an invocation is a DynamoDB stream batch
+    """
+    records = event.get('Records')
+    return bool(records) and records[0].get('eventSource') == 'aws:dynamodb'
+
+def stream_handler(event, context):
+    """
+    DynamoDB Streams entry point keeping the aggregates item up to date.
+    Records are applied in order; if one fails, it is reported as the batch
+    item failure so Lambda retries from there (ReportBatchItemFailures).
+    Already-applied records are skipped on retry.
+    """
+    for record in event.get('Records', []):
+        try:
+            apply_stream_record(record)
+        except Exception as e:
+            return {'batchItemFailures': [{'itemIdentifier': record['dynamodb']['SequenceNumber']}]}
+    
+    return {'batchItemFailures': []}
 
 # Optional: Function to send notifications (DISABLED)
 async def send_notification(item):
@@ -843,4 +2686,12 @@ async def send_notification(item):
     DISABLED: Notifications are currently turned off
     """
     # Notifications are disabled - no emails will be sent
-    pass
\ No newline at end of file
+    pass
+
+# End of container init: stop timing imports before the warmup threads start (the
+# import stack isn't thread-safe), then warm connections
+if IMPORT_TIME_REPORT:
+    builtins.__import__ = _builtin_import
+if WARMUP_ON_INIT:
+    initialize()
+_init_ms = round((time.perf_counter() - _init_started) * 1000, 3)